@@ -5,3 +5,42 @@ Author: Jonas Schrage
 Date: 20.04.2023
 
 """
+import argparse
+from pathlib import Path
+
+from sql.indexes import apply_indexes, check_query_plans
+from sql.sql_handler import SQLHandler
+
+
+def main() -> None:
+    """Add the schema indexes to a database and check the query plans."""
+    parser = argparse.ArgumentParser(
+        prog="python -m sql",
+        description="Add the secondary indexes of the food schema to a db.",
+    )
+    parser.add_argument(
+        "db_path",
+        nargs="?",
+        default=Path.cwd() / "sql" / "example.db",
+        type=Path,
+        help="path to the sqlite db, defaults to sql/example.db",
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="print the query plans of the hot app queries",
+    )
+    args = parser.parse_args()
+
+    sql_handler = SQLHandler(args.db_path)
+    for index_name, outcome in apply_indexes(sql_handler).items():
+        print(f"{index_name}: {outcome}")
+    plans = check_query_plans(sql_handler)
+    if args.explain:
+        for query_name, plan in plans.items():
+            print(query_name, *plan, sep="\n    ")
+    print("All app queries use their indexes.")
+
+
+if __name__ == "__main__":
+    main()
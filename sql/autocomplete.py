@@ -0,0 +1,337 @@
+"""
+This module contains the name search behind the autocomplete inputs.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import os
+import threading
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Literal, Tuple
+
+import sqlalchemy as sa
+
+from sql.engine_registry import get_engine
+
+SEARCH_TABLE = "_search_names"
+Kind = Literal["ingredient", "meal", "tag"]
+# Searched table and name column per kind. The rowid of a search row is
+# id * len(SOURCES) + position of the kind, so triggers find it by key.
+SOURCES: Dict[Kind, Tuple[str, str]] = {
+    "ingredient": ("ingredients", "ingredient_name"),
+    "meal": ("meals", "name"),
+    "tag": ("tags", "tag_name"),
+}
+TOP_K = 10
+# Rows fetched per search stage before ranking.
+CANDIDATES = 200
+# The trigram tokenizer only matches phrases of at least three characters.
+MIN_PHRASE = 3
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    """One autocomplete match."""
+
+    kind: Kind
+    ref: int
+    name: str
+    score: float
+
+
+def _phrase(text: str) -> str:
+    """Quote text as an FTS5 phrase.
+
+    Args:
+        text (str): raw text
+
+    Returns:
+        str: phrase matching text as substring
+    """
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _fuzzy_queries(text: str) -> List[str]:
+    """Build match expressions that tolerate typos, strictest first.
+
+    The text is split into chunks. A single typo changes at most one of
+    them, so any name within one edit contains all chunks but one. The
+    looser expression only asks for any chunk, which also finds swapped
+    letters across a chunk border.
+
+    Args:
+        text (str): search text
+
+    Returns:
+        List[str]: FTS5 expressions, empty if the text is too short
+    """
+    parts = min(len(text) // MIN_PHRASE, 3)
+    if parts < 2:
+        return []
+    size = len(text) // parts
+    chunks = [
+        _phrase(text[i * size : (i + 1) * size if i < parts - 1 else None])
+        for i in range(parts)
+    ]
+    loose = " OR ".join(chunks)
+    if parts == 2:
+        return [loose]
+    strict = " OR ".join(
+        "(" + " AND ".join(c for j, c in enumerate(chunks) if j != skip) + ")"
+        for skip in range(parts)
+    )
+    return [strict, loose]
+
+
+class SearchIndex:
+    """FTS5 trigram index over the names of all kinds, synced by triggers."""
+
+    def __init__(self, db_path: Path | str) -> None:
+        """Initialize the class.
+
+        Args:
+            db_path (Path | str): path to db file
+        """
+        self.db_path = Path(db_path)
+        self.engine = get_engine(self.db_path)
+        self._lock = threading.Lock()
+        self._installed = False
+
+    @staticmethod
+    def _rowid(kind: Kind, ref: str) -> str:
+        """Return the SQL expression of the search rowid of a row.
+
+        Args:
+            kind (Kind): kind of the row
+            ref (str): SQL expression of the row id
+
+        Returns:
+            str: rowid expression
+        """
+        return f"{ref} * {len(SOURCES)} + {list(SOURCES).index(kind)}"
+
+    def _install_triggers(self, conn: sa.Connection, kind: Kind) -> None:
+        """Create the triggers keeping the index in sync with a table.
+
+        Args:
+            conn (sa.Connection): db connection
+            kind (Kind): kind whose table is synced
+        """
+        table, column = SOURCES[kind]
+        insert = (
+            f"INSERT INTO {SEARCH_TABLE} (rowid, name) "
+            f'VALUES ({self._rowid(kind, "NEW.id")}, NEW."{column}"); '
+        )
+        delete = (
+            f"DELETE FROM {SEARCH_TABLE} "
+            f'WHERE rowid = {self._rowid(kind, "OLD.id")}; '
+        )
+        bodies = {
+            "insert": ("INSERT", insert),
+            "delete": ("DELETE", delete),
+            "update": (f'UPDATE OF id, "{column}"', delete + insert),
+        }
+        for name, (event, body) in bodies.items():
+            conn.exec_driver_sql(
+                f'CREATE TRIGGER IF NOT EXISTS "_search_{table}_{name}" '
+                f'AFTER {event} ON "{table}" BEGIN {body}END'
+            )
+
+    def _fill(self, conn: sa.Connection, kind: Kind) -> None:
+        """Index all current names of a kind.
+
+        Args:
+            conn (sa.Connection): db connection
+            kind (Kind): kind to index
+        """
+        table, column = SOURCES[kind]
+        conn.exec_driver_sql(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, name) "
+            f'SELECT {self._rowid(kind, "id")}, "{column}" FROM "{table}"'
+        )
+
+    @staticmethod
+    def _exists(conn: sa.Connection) -> bool:
+        """Check if the search table was created in the db.
+
+        Args:
+            conn (sa.Connection): db connection
+
+        Returns:
+            bool: True if the search table exists
+        """
+        row = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (SEARCH_TABLE,)
+        ).first()
+        return row is not None
+
+    def install(self) -> None:
+        """Create the index and its triggers if missing."""
+        if self._installed:
+            return
+        with self._lock, self.engine.begin() as conn:
+            exists = self._exists(conn)
+            if not exists:
+                conn.exec_driver_sql(
+                    f"CREATE VIRTUAL TABLE {SEARCH_TABLE} "
+                    "USING fts5(name, tokenize = 'trigram')"
+                )
+            for kind in SOURCES:
+                if not exists:
+                    self._fill(conn, kind)
+                self._install_triggers(conn, kind)
+            self._installed = True
+
+    def rebuild(self, table_name: str) -> None:
+        """Index a table again from scratch.
+
+        Needed after a table was dropped and recreated, which also drops
+        its triggers. Nothing is done if the index was not created yet, it
+        is filled from scratch on first use.
+
+        Args:
+            table_name (str): table name, tables that are not searched are
+                ignored
+        """
+        for position, (kind, (table, _)) in enumerate(SOURCES.items()):
+            if table != table_name:
+                continue
+            with self._lock, self.engine.begin() as conn:
+                if not self._exists(conn):
+                    return
+                conn.exec_driver_sql(
+                    f"DELETE FROM {SEARCH_TABLE} WHERE rowid % ? = ?",
+                    (len(SOURCES), position),
+                )
+                self._fill(conn, kind)
+                self._install_triggers(conn, kind)
+
+    def _search(
+        self, conn: sa.Connection, where: str, params: Tuple, kind: Kind | None
+    ) -> List[Tuple[int, str]]:
+        """Fetch candidate rows of one search stage.
+
+        Args:
+            conn (sa.Connection): db connection
+            where (str): condition on the search table
+            params (Tuple): parameters of the condition
+            kind (Kind | None): only rows of this kind, all kinds if None
+
+        Returns:
+            List[Tuple[int, str]]: rowid and name per candidate
+        """
+        if kind is not None:
+            where += f" AND rowid % {len(SOURCES)} = ?"
+            params += (list(SOURCES).index(kind),)
+        rows = conn.exec_driver_sql(
+            f"SELECT rowid, name FROM {SEARCH_TABLE} WHERE {where} LIMIT ?",
+            params + (CANDIDATES,),
+        )
+        return [(rowid, name) for rowid, name in rows if name]
+
+    def suggest(
+        self, text: str | None, kind: Kind | None = None, k: int = TOP_K
+    ) -> List[Suggestion]:
+        """Return the best matching names for a search text.
+
+        Prefix matches rank first, then names containing the text. If there
+        are fewer than k of those, names sharing most of the text are added,
+        ranked by their similarity to the text. Texts shorter than MIN_PHRASE
+        characters get no suggestions, they would need a full scan.
+
+        Args:
+            text (str | None): search text
+            kind (Kind | None): only names of this kind, all kinds if None
+            k (int): number of suggestions. Defaults to TOP_K.
+
+        Returns:
+            List[Suggestion]: at most k suggestions, best first
+        """
+        text = (text or "").strip()
+        if len(text) < MIN_PHRASE:
+            return []
+        self.install()
+        needle = text.casefold()
+        found: Dict[int, Tuple[int, float, str]] = {}
+
+        def add(rows: List[Tuple[int, str]], fuzzy: bool = False) -> None:
+            for rowid, name in rows:
+                if rowid in found:
+                    continue
+                folded = name.casefold()
+                if fuzzy:
+                    score = SequenceMatcher(None, needle, folded).ratio()
+                    found[rowid] = (2, score, name)
+                else:
+                    found[rowid] = (int(not folded.startswith(needle)), 1, name)
+
+        with self.engine.connect() as conn:
+            # An ESCAPE clause keeps the trigram index from serving LIKE,
+            # texts with wildcards are left to the substring stage.
+            if "%" not in text and "_" not in text:
+                add(self._search(conn, "name LIKE ?", (text + "%",), kind))
+            match = f"{SEARCH_TABLE} MATCH ?"
+            if len(found) < k:
+                add(self._search(conn, match, (_phrase(text),), kind))
+            for fuzzy in _fuzzy_queries(text):
+                if len(found) >= k:
+                    break
+                add(self._search(conn, match, (fuzzy,), kind), fuzzy=True)
+        ranked = sorted(
+            found.items(),
+            key=lambda item: (
+                item[1][0],
+                -item[1][1],
+                len(item[1][2]),
+                item[1][2],
+            ),
+        )
+        kinds = list(SOURCES)
+        return [
+            Suggestion(
+                kinds[rowid % len(kinds)],
+                rowid // len(kinds),
+                name,
+                score,
+            )
+            for rowid, (_, score, name) in ranked[:k]
+        ]
+
+
+_indexes: Dict[Path, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _after_fork() -> None:
+    """Reset the locks of the indexes in a forked child process."""
+    global _indexes_lock  # pylint: disable=global-statement
+    _indexes_lock = threading.Lock()
+    for index in _indexes.values():
+        index._lock = threading.Lock()  # pylint: disable=protected-access
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def get_search_index(db_path: Path | str) -> SearchIndex:
+    """Return the process wide search index for a database.
+
+    Args:
+        db_path (Path | str): path to db file
+
+    Returns:
+        SearchIndex: shared index, created in the db on first use
+    """
+    key = Path(db_path).expanduser().resolve()
+    index = _indexes.get(key)
+    if index is not None:
+        return index
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = SearchIndex(key)
+            _indexes[key] = index
+        return index
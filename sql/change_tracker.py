@@ -0,0 +1,427 @@
+"""
+This module contains per table change tracking for sqlite databases.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import pandas as pd
+import sqlalchemy as sa
+
+from sql.engine_registry import get_engine
+
+VERSION_TABLE = "_table_versions"
+CHANGE_TABLE = "_row_changes"
+TRIGGER_EVENTS = ("INSERT", "UPDATE", "DELETE")
+# Versions of row changes kept in the log per table. Clients lagging further
+# behind get the full table again.
+CHANGE_WINDOW = 100_000
+
+
+@dataclass
+class TableDelta:
+    """Rows of a table that changed after a client's watermark."""
+
+    version: int
+    full: bool
+    key: List[str]
+    upserts: pd.DataFrame
+    deletes: List[List[Any]] = field(default_factory=list)
+
+
+class ChangeTracker:
+    """Track a change counter per table, maintained by sqlite triggers."""
+
+    def __init__(self, db_path: Path | str) -> None:
+        """Initialize the class.
+
+        Args:
+            db_path (Path | str): path to db file
+        """
+        self.db_path = Path(db_path).expanduser().resolve()
+        self.engine = get_engine(self.db_path)
+        self._lock = threading.Lock()
+        self._probe: sa.Connection | None = None
+        self._data_version: int | None = None
+        self._versions: Dict[str, int] = {}
+        self.install()
+
+    @staticmethod
+    def _tracked_tables(conn: sa.Connection) -> List[str]:
+        """List the user tables that should carry change triggers.
+
+        Tables starting with an underscore hold bookkeeping of this package,
+        e.g. the version counters or the search index, and are skipped.
+
+        Args:
+            conn (sa.Connection): db connection
+
+        Returns:
+            List[str]: table names
+        """
+        rows = conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_%' AND name NOT LIKE '\\_%' ESCAPE '\\'"
+        )
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def primary_key(conn: sa.Connection, table_name: str) -> List[str]:
+        """Return the primary key columns of a table in key order.
+
+        Args:
+            conn (sa.Connection): db connection
+            table_name (str): table name
+
+        Returns:
+            List[str]: key columns, empty if the table has no primary key
+        """
+        rows = conn.exec_driver_sql(f'PRAGMA table_info("{table_name}")')
+        key = sorted((row[5], row[1]) for row in rows if row[5] > 0)
+        return [name for _, name in key]
+
+    @staticmethod
+    def _trigger_body(name: str, event: str, key: List[str]) -> str:
+        """Build the statements a change trigger runs.
+
+        The version is bumped first, so the logged rows carry the version
+        that made them visible.
+
+        Args:
+            name (str): table name
+            event (str): INSERT, UPDATE or DELETE
+            key (List[str]): primary key columns of the table
+
+        Returns:
+            str: trigger statements
+        """
+        body = (
+            f"UPDATE {VERSION_TABLE} SET version = version + 1 "
+            f"WHERE table_name = '{name}'; "
+        )
+        if not key:
+            return body
+        rows = []
+        if event in ("UPDATE", "DELETE"):
+            rows.append(("OLD", 1))
+        if event in ("INSERT", "UPDATE"):
+            rows.append(("NEW", 0))
+        for ref, deleted in rows:
+            columns = ", ".join(f'{ref}."{col}"' for col in key)
+            body += (
+                f"INSERT OR REPLACE INTO {CHANGE_TABLE} "
+                "(table_name, row_key, row_id, version, deleted) "
+                f"SELECT '{name}', json_array({columns}), {ref}.rowid, "
+                f"version, {deleted} FROM {VERSION_TABLE} "
+                f"WHERE table_name = '{name}'; "
+            )
+        return body
+
+    def install(self, tables: Iterable[str] | None = None) -> None:
+        """Create the bookkeeping tables and the change triggers if missing.
+
+        Args:
+            tables (Iterable[str] | None): tables to track, defaults to all.
+        """
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+                "table_name TEXT PRIMARY KEY, "
+                "version INTEGER NOT NULL DEFAULT 0, "
+                "reset_version INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.exec_driver_sql(
+                f"CREATE TABLE IF NOT EXISTS {CHANGE_TABLE} ("
+                "table_name TEXT NOT NULL, "
+                "row_key TEXT NOT NULL, "
+                "row_id INTEGER NOT NULL, "
+                "version INTEGER NOT NULL, "
+                "deleted INTEGER NOT NULL, "
+                "PRIMARY KEY (table_name, row_key))"
+            )
+            conn.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS ix{CHANGE_TABLE}_version "
+                f"ON {CHANGE_TABLE} (table_name, version)"
+            )
+            names = (
+                list(tables)
+                if tables is not None
+                else self._tracked_tables(conn)
+            )
+            for name in names:
+                conn.exec_driver_sql(
+                    f"INSERT OR IGNORE INTO {VERSION_TABLE} "
+                    "(table_name, version) VALUES (?, 0)",
+                    (name,),
+                )
+                key = self.primary_key(conn, name)
+                for event in TRIGGER_EVENTS:
+                    conn.exec_driver_sql(
+                        f'CREATE TRIGGER IF NOT EXISTS "_track_{name}_'
+                        f'{event.lower()}" AFTER {event} ON "{name}" '
+                        f"BEGIN {self._trigger_body(name, event, key)}END"
+                    )
+        with self._lock:
+            self._data_version = None
+
+    def bump(self, table_name: str) -> None:
+        """Increase the version of a table by hand and force a full resync.
+
+        Needed after a table was dropped and recreated, which also drops
+        its triggers, so its row changes were not logged.
+
+        Args:
+            table_name (str): table name
+        """
+        self.install([table_name])
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"UPDATE {VERSION_TABLE} SET version = version + 1, "
+                "reset_version = version + 1 WHERE table_name = ?",
+                (table_name,),
+            )
+            conn.exec_driver_sql(
+                f"DELETE FROM {CHANGE_TABLE} WHERE table_name = ?",
+                (table_name,),
+            )
+
+    def versions(self) -> Dict[str, int]:
+        """Return the current version of every tracked table.
+
+        A dedicated connection polls PRAGMA data_version, which only changes
+        when another connection committed. The counters are read again only
+        in that case, so an idle database costs a single pragma per call.
+
+        Returns:
+            Dict[str, int]: version per table name
+        """
+        with self._lock:
+            if self._probe is None or self._probe.closed:
+                self._probe = self.engine.connect()
+            data_version = int(
+                self._probe.exec_driver_sql("PRAGMA data_version").scalar_one()
+            )
+            overdue = False
+            if data_version != self._data_version:
+                rows = self._probe.exec_driver_sql(
+                    f"SELECT table_name, version FROM {VERSION_TABLE}"
+                )
+                self._versions = dict(rows.tuples().all())
+                self._data_version = data_version
+                overdue = (
+                    self._probe.exec_driver_sql(
+                        f"SELECT 1 FROM {VERSION_TABLE} "
+                        "WHERE version - reset_version > ?",
+                        (2 * CHANGE_WINDOW,),
+                    ).first()
+                    is not None
+                )
+            self._probe.rollback()
+            versions = dict(self._versions)
+        if overdue:
+            self.compact()
+        return versions
+
+    def compact(self, window: int = CHANGE_WINDOW) -> None:
+        """Drop logged row changes older than the last window versions.
+
+        The change log keeps one row per key ever written, so it is trimmed
+        whenever a table is more than two windows past its reset version.
+        Clients whose watermark is older than the kept changes get the full
+        table on their next delta, as after a bump.
+
+        Args:
+            window (int): versions of changes kept per table. Defaults to
+                CHANGE_WINDOW.
+        """
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"UPDATE {VERSION_TABLE} SET reset_version = version - ? "
+                "WHERE version - reset_version > ?",
+                (window, window),
+            )
+            rows = conn.exec_driver_sql(
+                f"SELECT table_name, reset_version FROM {VERSION_TABLE}"
+            ).all()
+            for table_name, reset_version in rows:
+                conn.exec_driver_sql(
+                    f"DELETE FROM {CHANGE_TABLE} "
+                    "WHERE table_name = ? AND version <= ?",
+                    (table_name, reset_version),
+                )
+
+    def table_version(self, table_name: str) -> int:
+        """Return the current version of a table.
+
+        Args:
+            table_name (str): table name
+
+        Raises:
+            KeyError: Table is not tracked.
+
+        Returns:
+            int: change counter of the table
+        """
+        versions = self.versions()
+        if table_name not in versions:
+            raise KeyError(f"Table {table_name} is not tracked.")
+        return versions[table_name]
+
+    def delta(self, table_name: str, since: int | None) -> TableDelta:
+        """Return the rows of a table that changed after a watermark.
+
+        Falls back to the full table if the client has no watermark yet, the
+        table has no primary key or it was replaced after the watermark.
+
+        Args:
+            table_name (str): table name
+            since (int | None): version the client holds, None if unknown
+
+        Returns:
+            TableDelta: changed rows, deleted keys and the new watermark
+        """
+        with self.engine.connect() as conn, conn.begin():
+            return self._read_delta(conn, table_name, since)
+
+    def snapshot(
+        self, known: Dict[str, int | None], parallel: bool = False
+    ) -> Dict[str, TableDelta | None]:
+        """Return the deltas of several tables read from one snapshot.
+
+        All tables are read inside one read transaction on one connection,
+        so the deltas are consistent with each other. Tables whose version
+        equals the known one are skipped.
+
+        Args:
+            known (Dict[str, int | None]): version the client holds per table
+            parallel (bool): read the tables concurrently, each on its own
+                connection. Faster for large deltas, but the tables are no
+                longer read from a single snapshot. Defaults to False.
+
+        Returns:
+            Dict[str, TableDelta | None]: delta per table, None if unchanged
+        """
+        versions = self.versions()
+        changed = [
+            name for name, since in known.items() if versions.get(name) != since
+        ]
+        result: Dict[str, TableDelta | None] = dict.fromkeys(known)
+        if parallel and len(changed) > 1:
+            with ThreadPoolExecutor(max_workers=len(changed)) as pool:
+                futures = {
+                    name: pool.submit(self.delta, name, known[name])
+                    for name in changed
+                }
+            result.update((name, f.result()) for name, f in futures.items())
+        elif changed:
+            with self.engine.connect() as conn:
+                # pysqlite defers BEGIN until the first write, start the read
+                # transaction by hand so every table sees the same snapshot.
+                conn.exec_driver_sql("BEGIN")
+                for name in changed:
+                    result[name] = self._read_delta(conn, name, known[name])
+                conn.rollback()
+        return result
+
+    def _read_delta(
+        self, conn: sa.Connection, table_name: str, since: int | None
+    ) -> TableDelta:
+        """Read the delta of a table on an open connection.
+
+        Args:
+            conn (sa.Connection): db connection
+            table_name (str): table name
+            since (int | None): version the client holds, None if unknown
+
+        Returns:
+            TableDelta: changed rows, deleted keys and the new watermark
+        """
+        version, reset_version = conn.exec_driver_sql(
+            f"SELECT version, reset_version FROM {VERSION_TABLE} "
+            "WHERE table_name = ?",
+            (table_name,),
+        ).one()
+        key = self.primary_key(conn, table_name)
+        if since is None or not key or since < reset_version:
+            upserts = pd.read_sql(
+                sa.text(f'SELECT * FROM "{table_name}"'), conn
+            )
+            return TableDelta(version, True, key, upserts)
+        params: Dict[str, Any] = {"table": table_name, "since": since}
+        upserts = pd.read_sql(
+            sa.text(
+                f'SELECT t.* FROM "{table_name}" AS t '
+                f"JOIN {CHANGE_TABLE} AS c ON t.rowid = c.row_id "
+                "WHERE c.table_name = :table AND c.version > :since "
+                "AND c.deleted = 0 ORDER BY t.rowid"
+            ),
+            conn,
+            params=params,
+        )
+        deletes = [
+            json.loads(row[0])
+            for row in conn.exec_driver_sql(
+                f"SELECT row_key FROM {CHANGE_TABLE} "
+                "WHERE table_name = ? AND version > ? AND deleted = 1",
+                (table_name, since),
+            )
+        ]
+        return TableDelta(version, False, key, upserts, deletes)
+
+    def close(self) -> None:
+        """Return the probe connection to the pool."""
+        with self._lock:
+            if self._probe is not None:
+                self._probe.close()
+                self._probe = None
+            self._data_version = None
+
+    def after_fork(self) -> None:
+        """Forget the probe connection inherited from the parent process."""
+        self._lock = threading.Lock()
+        self._probe = None
+        self._data_version = None
+
+
+_trackers: Dict[Path, ChangeTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def _after_fork() -> None:
+    """Reset the trackers in a forked child process."""
+    global _trackers_lock  # pylint: disable=global-statement
+    _trackers_lock = threading.Lock()
+    for tracker in _trackers.values():
+        tracker.after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def get_tracker(db_path: Path | str) -> ChangeTracker:
+    """Return the process wide change tracker for a database.
+
+    Args:
+        db_path (Path | str): path to db file
+
+    Returns:
+        ChangeTracker: shared tracker, triggers installed on first use
+    """
+    key = Path(db_path).expanduser().resolve()
+    tracker = _trackers.get(key)
+    if tracker is not None:
+        return tracker
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = ChangeTracker(key)
+            _trackers[key] = tracker
+        return tracker
@@ -0,0 +1,230 @@
+"""
+This module contains a process wide registry of sqlalchemy engines.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict
+
+import sqlalchemy as sa
+
+from sql.metrics import metrics
+
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+POOL_TIMEOUT = 30
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """Pragmas applied to every new sqlite connection."""
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -64_000
+    mmap_size: int = 256 * 1024 * 1024
+    temp_store: str = "MEMORY"
+    busy_timeout: int = 5_000
+
+    def pragmas(self) -> Dict[str, Any]:
+        """Return the pragma statements of the profile in execution order.
+
+        Returns:
+            Dict[str, Any]: value per pragma name
+        """
+        return {
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "cache_size": self.cache_size,
+            "mmap_size": self.mmap_size,
+            "temp_store": self.temp_store,
+            "busy_timeout": self.busy_timeout,
+        }
+
+    def apply(self, dbapi_connection: Any, _connection_record: Any) -> None:
+        """Set the pragmas on a new connection, used as connect hook.
+
+        Args:
+            dbapi_connection (Any): raw sqlite3 connection
+            _connection_record (Any): pool record, unused
+        """
+        cursor = dbapi_connection.cursor()
+        for name, value in self.pragmas().items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+# WAL lets readers continue while a writer commits, NORMAL sync is safe with
+# WAL and avoids an fsync per transaction.
+DEFAULT_PROFILE = SQLiteProfile()
+STOCK_PROFILE = SQLiteProfile(
+    journal_mode="DELETE",
+    synchronous="FULL",
+    cache_size=-2_000,
+    mmap_size=0,
+    temp_store="DEFAULT",
+)
+
+
+class EngineRegistry:
+    """Hand out one long-lived engine per database file."""
+
+    def __init__(
+        self,
+        pool_size: int = POOL_SIZE,
+        max_overflow: int = MAX_OVERFLOW,
+        pool_timeout: int = POOL_TIMEOUT,
+        profile: SQLiteProfile = DEFAULT_PROFILE,
+    ) -> None:
+        """Initialize the class.
+
+        Args:
+            pool_size (int): connections kept open per engine.
+            max_overflow (int): extra connections allowed under load.
+            pool_timeout (int): seconds to wait for a free connection.
+            profile (SQLiteProfile): pragmas set on every connection.
+        """
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.profile = profile
+        self._engines: Dict[Path, sa.Engine] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(db_path: Path | str) -> Path:
+        """Normalize a database path into a registry key.
+
+        Args:
+            db_path (Path | str): path to db file
+
+        Returns:
+            Path: absolute, resolved path
+        """
+        return Path(db_path).expanduser().resolve()
+
+    def get_engine(self, db_path: Path | str) -> sa.Engine:
+        """Return the shared engine for a database, creating it once.
+
+        Args:
+            db_path (Path | str): path to db file
+
+        Returns:
+            sa.Engine: engine shared by all callers in this process
+        """
+        key = self._key(db_path)
+        engine = self._engines.get(key)
+        if engine is not None:
+            return engine
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is None:
+                # Pooled connections are handed between Flask worker
+                # threads, so sqlite's same-thread check must be disabled.
+                engine = sa.create_engine(
+                    f"sqlite:///{key}",
+                    poolclass=sa.QueuePool,
+                    pool_size=self.pool_size,
+                    max_overflow=self.max_overflow,
+                    pool_timeout=self.pool_timeout,
+                    pool_pre_ping=False,
+                    connect_args={"check_same_thread": False},
+                )
+                sa.event.listen(engine, "connect", self.profile.apply)
+                if metrics.mode != "off":
+                    metrics.instrument_engine(engine)
+                self._engines[key] = engine
+            return engine
+
+    def pool_stats(self, db_path: Path | str) -> Dict[str, int | str]:
+        """Return connection pool statistics for a database.
+
+        Args:
+            db_path (Path | str): path to db file
+
+        Raises:
+            KeyError: No engine has been created for the database.
+
+        Returns:
+            Dict[str, int | str]: pool size, checked in/out and overflow counts
+        """
+        key = self._key(db_path)
+        if key not in self._engines:
+            raise KeyError(f"No engine registered for {key}.")
+        pool = self._engines[key].pool
+        assert isinstance(pool, sa.QueuePool)
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "status": pool.status(),
+        }
+
+    def all_pool_stats(self) -> Dict[str, Dict[str, int | str]]:
+        """Return pool statistics for every registered database.
+
+        Returns:
+            Dict[str, Dict[str, int | str]]: statistics keyed by db path
+        """
+        return {str(key): self.pool_stats(key) for key in list(self._engines)}
+
+    def dispose(self, db_path: Path | str | None = None) -> None:
+        """Close pooled connections and forget the engine(s).
+
+        Args:
+            db_path (Path | str | None): database to dispose, defaults to all.
+        """
+        with self._lock:
+            keys = (
+                list(self._engines) if db_path is None else [self._key(db_path)]
+            )
+            for key in keys:
+                engine = self._engines.pop(key, None)
+                if engine is not None:
+                    engine.dispose()
+
+    def after_fork(self) -> None:
+        """Give every engine a fresh pool in a forked worker process.
+
+        Connections inherited from the parent are dropped without closing
+        them, so the parent can keep using its own.
+        """
+        # The lock may have been held by another thread at fork time.
+        self._lock = threading.Lock()
+        for engine in self._engines.values():
+            engine.dispose(close=False)
+
+
+registry = EngineRegistry()
+# Forked workers and background jobs must not share pooled connections.
+os.register_at_fork(after_in_child=registry.after_fork)
+
+
+def get_engine(db_path: Path | str) -> sa.Engine:
+    """Return the process wide engine for a database.
+
+    Args:
+        db_path (Path | str): path to db file
+
+    Returns:
+        sa.Engine: shared engine
+    """
+    return registry.get_engine(db_path)
+
+
+def pool_stats(db_path: Path | str) -> Dict[str, int | str]:
+    """Return pool statistics of the process wide engine for a database.
+
+    Args:
+        db_path (Path | str): path to db file
+
+    Returns:
+        Dict[str, int | str]: pool statistics
+    """
+    return registry.pool_stats(db_path)
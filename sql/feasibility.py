@@ -0,0 +1,398 @@
+"""
+This module contains the vectorized check which meals can be cooked.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sql.change_tracker import TableDelta, get_tracker
+from sql.sql_handler import ReadOptions, SQLHandler
+
+
+@dataclass
+class EntryIndex:
+    """Positions of the entries of a RequirementMatrix per column and row.
+
+    The entries are sorted by column, col_ptr[j]:col_ptr[j + 1] are the
+    entries of ingredient j. The entries of meal i are
+    row_order[row_ptr[i]:row_ptr[i + 1]].
+    """
+
+    col_ptr: np.ndarray
+    row_order: np.ndarray
+    row_ptr: np.ndarray
+
+
+@dataclass
+class RequirementMatrix:
+    """Sparse meal x ingredient matrix of recipe amounts in COO form.
+
+    Entry k says that meal rows[k] needs amounts[k] of ingredient cols[k].
+    """
+
+    meal_ids: np.ndarray
+    meal_names: np.ndarray
+    ingredient_ids: np.ndarray
+    rows: np.ndarray
+    cols: np.ndarray
+    amounts: np.ndarray
+    index: EntryIndex
+
+    @classmethod
+    def from_frames(
+        cls, meals: pd.DataFrame, ingredients: pd.DataFrame
+    ) -> "RequirementMatrix":
+        """Build the matrix from the meals and ingredients tables.
+
+        Args:
+            meals (pd.DataFrame): id and name of every meal
+            ingredients (pd.DataFrame): id, meal_id and recipe_amount of
+                every ingredient
+
+        Returns:
+            RequirementMatrix: requirements of all meals
+        """
+        meal_ids = meals["id"].to_numpy()
+        ingredient_ids = ingredients["id"].to_numpy()
+        needed = ingredients[
+            ingredients["meal_id"].isin(meal_ids)
+            & (ingredients["recipe_amount"].fillna(0) > 0)
+        ]
+        meal_order = np.argsort(meal_ids)
+        rows = meal_order[
+            np.searchsorted(
+                meal_ids, needed["meal_id"].to_numpy(), sorter=meal_order
+            )
+        ]
+        cols = ingredients.index.get_indexer(needed.index)
+        order = np.argsort(cols, kind="stable")
+        cols = cols[order]
+        rows = rows[order]
+        row_order = np.argsort(rows, kind="stable")
+        return cls(
+            meal_ids=meal_ids,
+            meal_names=meals["name"].to_numpy(),
+            ingredient_ids=ingredient_ids,
+            rows=rows,
+            cols=cols,
+            amounts=needed["recipe_amount"].to_numpy(dtype=float)[order],
+            index=EntryIndex(
+                col_ptr=np.searchsorted(
+                    cols, np.arange(len(ingredient_ids) + 1)
+                ),
+                row_order=row_order,
+                row_ptr=np.searchsorted(
+                    rows[row_order], np.arange(len(meal_ids) + 1)
+                ),
+            ),
+        )
+
+    def meal_rows(self, meal_ids: np.ndarray) -> np.ndarray:
+        """Look up the matrix rows of meals.
+
+        Args:
+            meal_ids (np.ndarray): meal ids
+
+        Returns:
+            np.ndarray: row per meal id, -1 for unknown meals
+        """
+        meal_ids = np.asarray(meal_ids)
+        if len(self.meal_ids) == 0:
+            return np.full(len(meal_ids), -1)
+        order = np.argsort(self.meal_ids)
+        pos = np.searchsorted(self.meal_ids, meal_ids, sorter=order)
+        rows = order[np.minimum(pos, len(order) - 1)]
+        return np.where(self.meal_ids[rows] == meal_ids, rows, -1)
+
+    def meal_entries(self, rows: np.ndarray) -> np.ndarray:
+        """Collect the entries of several meals.
+
+        Args:
+            rows (np.ndarray): matrix rows of the meals
+
+        Returns:
+            np.ndarray: entry indices of all the meals, in the order of rows
+        """
+        if len(rows) == 0:
+            return np.zeros(0, dtype=np.int64)
+        row_ptr = self.index.row_ptr
+        return self.index.row_order[
+            np.concatenate(
+                [np.arange(row_ptr[row], row_ptr[row + 1]) for row in rows]
+            )
+        ]
+
+    def meal_sizes(self, rows: np.ndarray) -> np.ndarray:
+        """Count the entries of several meals.
+
+        Args:
+            rows (np.ndarray): matrix rows of the meals
+
+        Returns:
+            np.ndarray: number of ingredients per meal
+        """
+        row_ptr = self.index.row_ptr
+        return row_ptr[rows + 1] - row_ptr[rows]
+
+    def column_entries(self, col: int) -> slice:
+        """Return the entries of one ingredient.
+
+        Args:
+            col (int): matrix column of the ingredient
+
+        Returns:
+            slice: range of the entries of the column
+        """
+        col_ptr = self.index.col_ptr
+        return slice(col_ptr[col], col_ptr[col + 1])
+
+
+class FeasibilityEngine:
+    """Track for every meal how many ingredients are short in stock."""
+
+    def __init__(self, db_path: Path | str) -> None:
+        """Initialize the class.
+
+        Args:
+            db_path (Path | str): path to db file
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self.matrix: RequirementMatrix | None = None
+        self.inventory = np.zeros(0)
+        self.short = np.zeros(0, dtype=np.int64)
+        self._positions: Dict[int, int] = {}
+        self._versions: Dict[str, int] = {}
+
+    def rebuild(self) -> None:
+        """Read meals and ingredients and compute every meal from scratch."""
+        tracker = get_tracker(self.db_path)
+        versions = tracker.versions()
+        handler = SQLHandler(self.db_path)
+        meals = handler.read_table("meals", ReadOptions(columns=["id", "name"]))
+        ingredients = handler.read_table(
+            "ingredients",
+            ReadOptions(
+                columns=["id", "meal_id", "recipe_amount", "inventory_amount"],
+                order_by=["id"],
+            ),
+        )
+        self.matrix = RequirementMatrix.from_frames(meals, ingredients)
+        self.inventory = (
+            ingredients["inventory_amount"]
+            .fillna(0)
+            .to_numpy(dtype=float, copy=True)
+        )
+        self._positions = {
+            int(ingredient_id): pos
+            for pos, ingredient_id in enumerate(self.matrix.ingredient_ids)
+        }
+        self.short = self._count_short(self.matrix, self.inventory)
+        self._versions = {
+            name: versions[name] for name in ("meals", "ingredients")
+        }
+
+    @staticmethod
+    def _count_short(
+        matrix: RequirementMatrix, inventory: np.ndarray
+    ) -> np.ndarray:
+        """Count the ingredients each meal has not enough of.
+
+        Args:
+            matrix (RequirementMatrix): requirements
+            inventory (np.ndarray): amount in stock per ingredient column
+
+        Returns:
+            np.ndarray: short ingredients per meal row
+        """
+        short = inventory[matrix.cols] < matrix.amounts
+        return np.bincount(
+            matrix.rows, weights=short, minlength=len(matrix.meal_ids)
+        ).astype(np.int64)
+
+    def update_inventory(self, ingredient_id: int, amount: float) -> None:
+        """Apply a new inventory amount, recomputing only affected meals.
+
+        Args:
+            ingredient_id (int): changed ingredient
+            amount (float): new inventory amount
+
+        Raises:
+            KeyError: Unknown ingredient.
+        """
+        with self._lock:
+            self._update_inventory(ingredient_id, amount)
+
+    def _update_inventory(self, ingredient_id: int, amount: float) -> None:
+        """Apply a new inventory amount while holding the lock.
+
+        Args:
+            ingredient_id (int): changed ingredient
+            amount (float): new inventory amount
+
+        Raises:
+            KeyError: Unknown ingredient.
+        """
+        assert self.matrix is not None
+        if ingredient_id not in self._positions:
+            raise KeyError(f"Ingredient {ingredient_id} does not exist.")
+        col = self._positions[ingredient_id]
+        entries = self.matrix.column_entries(col)
+        needed = self.matrix.amounts[entries]
+        was_short = self.inventory[col] < needed
+        is_short = amount < needed
+        np.add.at(
+            self.short,
+            self.matrix.rows[entries],
+            is_short.astype(np.int64) - was_short,
+        )
+        self.inventory[col] = amount
+
+    def refresh(self) -> None:
+        """Bring the engine up to date with the db.
+
+        Changes of inventory amounts only are applied incrementally, any
+        other change of meals or ingredients rebuilds the matrix.
+        """
+        with self._lock:
+            if self.matrix is None:
+                self.rebuild()
+                return
+            tracker = get_tracker(self.db_path)
+            versions = tracker.versions()
+            if versions.get("meals") != self._versions["meals"]:
+                self.rebuild()
+                return
+            since = self._versions["ingredients"]
+            if versions.get("ingredients") == since:
+                return
+            delta = tracker.delta("ingredients", since)
+            if not self._apply_delta(delta):
+                self.rebuild()
+                return
+            self._versions["ingredients"] = delta.version
+
+    def _apply_delta(self, delta: TableDelta) -> bool:
+        """Apply changed ingredient rows if only inventory amounts changed.
+
+        Args:
+            delta (TableDelta): changes of the ingredients table
+
+        Returns:
+            bool: False if the matrix itself changed and must be rebuilt
+        """
+        assert self.matrix is not None
+        if delta.full or delta.deletes:
+            return False
+        upserts = delta.upserts
+        if not upserts["id"].isin(list(self._positions)).all():
+            return False
+        cols = np.array([self._positions[int(i)] for i in upserts["id"]])
+        meal_ids = self.matrix.meal_ids
+        # Requirements of the changed columns as stored in the matrix.
+        for col, meal_id, recipe_amount in zip(
+            cols, upserts["meal_id"], upserts["recipe_amount"]
+        ):
+            entries = self.matrix.column_entries(col)
+            stored = {
+                (meal_ids[row], amount)
+                for row, amount in zip(
+                    self.matrix.rows[entries], self.matrix.amounts[entries]
+                )
+            }
+            expected = (
+                {(meal_id, float(recipe_amount))}
+                if pd.notna(meal_id)
+                and meal_id in meal_ids
+                and pd.notna(recipe_amount)
+                and recipe_amount > 0
+                else set()
+            )
+            if stored != expected:
+                return False
+        for col, amount in zip(cols, upserts["inventory_amount"].fillna(0)):
+            self._update_inventory(
+                int(self.matrix.ingredient_ids[col]), float(amount)
+            )
+        return True
+
+    def snapshot(self) -> Tuple[RequirementMatrix, np.ndarray]:
+        """Return the current requirements and a copy of the inventory.
+
+        Returns:
+            Tuple[RequirementMatrix, np.ndarray]: requirements and amount in
+            stock per ingredient column
+        """
+        self.refresh()
+        with self._lock:
+            assert self.matrix is not None
+            return self.matrix, self.inventory.copy()
+
+    def feasible_meals(self, limit: int | None = None) -> pd.DataFrame:
+        """Report for every meal whether it can be cooked from stock.
+
+        Args:
+            limit (int | None): maximum number of meals, defaults to all.
+
+        Returns:
+            pd.DataFrame: meal_id, name, short (number of ingredients with
+            too little stock) and feasible, fewest short first
+        """
+        self.refresh()
+        with self._lock:
+            assert self.matrix is not None
+            order = np.argsort(self.short, kind="stable")[:limit]
+            result = pd.DataFrame(
+                {
+                    "meal_id": self.matrix.meal_ids[order],
+                    "name": self.matrix.meal_names[order],
+                    "short": self.short[order],
+                }
+            )
+        result["feasible"] = result["short"] == 0
+        return result
+
+
+_engines: Dict[Path, FeasibilityEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def _after_fork() -> None:
+    """Reset the locks of the engines in a forked child process."""
+    global _engines_lock  # pylint: disable=global-statement
+    _engines_lock = threading.Lock()
+    for engine in _engines.values():
+        engine._lock = threading.Lock()  # pylint: disable=protected-access
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def get_feasibility(db_path: Path | str) -> FeasibilityEngine:
+    """Return the process wide feasibility engine for a database.
+
+    Args:
+        db_path (Path | str): path to db file
+
+    Returns:
+        FeasibilityEngine: shared engine, built on first use
+    """
+    key = Path(db_path).expanduser().resolve()
+    engine = _engines.get(key)
+    if engine is not None:
+        return engine
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = FeasibilityEngine(key)
+            _engines[key] = engine
+        return engine
@@ -0,0 +1,249 @@
+"""
+This module contains the secondary indexes of the food schema.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+import sqlalchemy as sa
+
+from sql.inventory import PageQuery, fetch_inventory_page
+from sql.sql_handler import SQLHandler
+
+
+@dataclass
+class IndexSpec:
+    """Definition of one secondary index."""
+
+    name: str
+    table: str
+    columns: List[str]
+    unique: bool = False
+
+    def ddl(self, unique: bool | None = None) -> str:
+        """Return the CREATE INDEX statement of the index.
+
+        Args:
+            unique (bool | None): override the uniqueness of the spec.
+
+        Returns:
+            str: idempotent DDL statement
+        """
+        unique = self.unique if unique is None else unique
+        return (
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS "
+            f'"{self.name}" ON "{self.table}" ({", ".join(self.columns)})'
+        )
+
+
+INDEXES = [
+    IndexSpec("ux_tags_tag_name", "tags", ["tag_name"], unique=True),
+    IndexSpec(
+        "ux_ingredients_ingredient_name",
+        "ingredients",
+        ["ingredient_name"],
+        unique=True,
+    ),
+    IndexSpec("ix_ingredient_tags_tag_id", "ingredient_tags", ["tag_id"]),
+    IndexSpec("ix_ingredients_meal_id", "ingredients", ["meal_id"]),
+    # Keyset pagination sorts by these expressions, see sql.inventory.
+    IndexSpec(
+        "ix_ingredients_sort_name",
+        "ingredients",
+        ["coalesce(ingredient_name, '')", "id"],
+    ),
+    IndexSpec(
+        "ix_ingredients_sort_amount",
+        "ingredients",
+        ["coalesce(inventory_amount, 0)", "id"],
+    ),
+]
+
+
+def _duplicates(conn: sa.Connection, spec: IndexSpec) -> List[str]:
+    """Return the values that prevent a unique index from being created.
+
+    Args:
+        conn (sa.Connection): db connection
+        spec (IndexSpec): unique index
+
+    Returns:
+        List[str]: duplicated values
+    """
+    columns = ", ".join(spec.columns)
+    rows = conn.exec_driver_sql(
+        f'SELECT {columns} FROM "{spec.table}" '
+        f"GROUP BY {columns} HAVING count(*) > 1"
+    )
+    return [", ".join(str(value) for value in row) for row in rows]
+
+
+def _existing_unique(conn: sa.Connection, spec: IndexSpec) -> bool | None:
+    """Check whether an index exists and enforces uniqueness.
+
+    Args:
+        conn (sa.Connection): db connection
+        spec (IndexSpec): index to look up
+
+    Returns:
+        bool | None: uniqueness of the existing index, None if it is missing
+    """
+    rows = conn.exec_driver_sql(f'PRAGMA index_list("{spec.table}")')
+    for row in rows:
+        if row[1] == spec.name:
+            return bool(row[2])
+    return None
+
+
+def apply_indexes(handler: SQLHandler) -> Dict[str, str]:
+    """Create all missing indexes, safe to run repeatedly.
+
+    Unique indexes fall back to a plain index if the table already holds
+    duplicates, so lookups are still indexed until the data is cleaned. Such
+    a fallback is replaced by the unique index on the first run after the
+    duplicates are gone.
+
+    Args:
+        handler (SQLHandler): handler connected to the food db
+
+    Returns:
+        Dict[str, str]: outcome per index name
+    """
+    report = {}
+    with handler.engine.begin() as conn:
+        for spec in INDEXES:
+            duplicates = _duplicates(conn, spec) if spec.unique else []
+            if duplicates:
+                conn.exec_driver_sql(spec.ddl(unique=False))
+                report[spec.name] = (
+                    "created without unique constraint, duplicates: "
+                    + "; ".join(duplicates)
+                )
+            elif spec.unique and _existing_unique(conn, spec) is False:
+                conn.exec_driver_sql(f'DROP INDEX "{spec.name}"')
+                conn.exec_driver_sql(spec.ddl())
+                report[spec.name] = "replaced fallback by unique index"
+            else:
+                conn.exec_driver_sql(spec.ddl())
+                report[spec.name] = "ok"
+    handler.invalidate_schema()
+    return report
+
+
+def app_queries(handler: SQLHandler) -> Dict[str, sa.Select]:
+    """Return the hot queries of the app together with a descriptive name.
+
+    Args:
+        handler (SQLHandler): handler connected to the food db
+
+    Returns:
+        Dict[str, sa.Select]: query per name
+    """
+    tags = handler.get_table("tags")
+    ingredients = handler.get_table("ingredients")
+    ingredient_tags = handler.get_table("ingredient_tags")
+    return {
+        "tag by name": sa.select(tags.c.id).where(tags.c.tag_name == "x"),
+        "ingredient by name": sa.select(ingredients.c.id).where(
+            ingredients.c.ingredient_name == "x"
+        ),
+        "ingredients of tag": sa.select(ingredient_tags.c.ingredient_id).where(
+            ingredient_tags.c.tag_id == 1
+        ),
+        "ingredients of meal": sa.select(ingredients.c.id).where(
+            ingredients.c.meal_id == 1
+        ),
+    }
+
+
+EXPECTED_INDEXES = {
+    "tag by name": "ux_tags_tag_name",
+    "ingredient by name": "ux_ingredients_ingredient_name",
+    "ingredients of tag": "ix_ingredient_tags_tag_id",
+    "ingredients of meal": "ix_ingredients_meal_id",
+    "inventory page by name": "ix_ingredients_sort_name",
+    "inventory page by amount": "ix_ingredients_sort_amount",
+}
+
+
+def explain(
+    conn: sa.Connection, stmt: sa.Select | str, parameters: Any = ()
+) -> List[str]:
+    """Return the EXPLAIN QUERY PLAN lines of a statement.
+
+    Args:
+        conn (sa.Connection): db connection
+        stmt (sa.Select | str): statement to explain
+        parameters (Any): driver parameters of a string statement
+
+    Returns:
+        List[str]: plan details
+    """
+    if isinstance(stmt, sa.Select):
+        stmt = str(stmt.compile(conn, compile_kwargs={"literal_binds": True}))
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {stmt}", parameters)
+    return [row[-1] for row in rows]
+
+
+def _capture_statements(statements: List[Tuple[str, Any]]) -> Callable:
+    """Create an engine event listener that records executed statements.
+
+    Args:
+        statements (List[Tuple[str, Any]]): list the statements are added to
+
+    Returns:
+        Callable: before_cursor_execute listener
+    """
+
+    def listener(  # pylint: disable=too-many-arguments
+        _conn: sa.Connection,
+        _cursor: Any,
+        statement: str,
+        parameters: Any,
+        _context: Any,
+        _executemany: bool,
+    ) -> None:
+        statements.append((statement, parameters))
+
+    return listener
+
+
+def check_query_plans(handler: SQLHandler) -> Dict[str, List[str]]:
+    """Check that the hot queries of the app use their indexes.
+
+    Args:
+        handler (SQLHandler): handler connected to the food db
+
+    Raises:
+        AssertionError: A query does not use its expected index.
+
+    Returns:
+        Dict[str, List[str]]: query plan per query name
+    """
+    plans = {}
+    with handler.engine.connect() as conn:
+        for name, stmt in app_queries(handler).items():
+            plans[name] = explain(conn, stmt)
+        for sort in ("name", "amount"):
+            statements: List[Tuple[str, Any]] = []
+            listener = _capture_statements(statements)
+            sa.event.listen(handler.engine, "before_cursor_execute", listener)
+            try:
+                fetch_inventory_page(handler, PageQuery(sort=sort))
+            finally:
+                sa.event.remove(
+                    handler.engine, "before_cursor_execute", listener
+                )
+            page_stmt = next(s for s in statements if "group_concat" in s[0])
+            plans[f"inventory page by {sort}"] = explain(conn, *page_stmt)
+    missing = [
+        name
+        for name, index in EXPECTED_INDEXES.items()
+        if not any(index in line for line in plans[name])
+    ]
+    if missing:
+        raise AssertionError(f"Queries not using their index: {missing}")
+    return plans
@@ -0,0 +1,318 @@
+"""
+This module contains keyset paginated queries for the inventory view.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import json
+from dataclasses import dataclass
+from typing import Any, List, Literal, Sequence, Tuple
+
+import pandas as pd
+import sqlalchemy as sa
+
+from sql.sql_handler import SQLHandler
+
+PAGE_SIZE = 50
+# Rows after, before or starting at the cursor of a page.
+Direction = Literal["after", "before", "at"]
+TAG_SEPARATOR = "\x1f"
+SORT_KEYS = {
+    "name": ("ingredient_name", ""),
+    "amount": ("inventory_amount", 0),
+}
+
+
+@dataclass
+class InventoryPage:
+    """One window of the inventory together with its keyset cursors."""
+
+    items: pd.DataFrame
+    first: List[Any] | None
+    last: List[Any] | None
+    has_prev: bool
+    has_next: bool
+
+
+@dataclass(frozen=True)
+class PageQuery:
+    """Sort order, name filter and position of an inventory page.
+
+    Frozen, so a query can key the memoized pages.
+    """
+
+    sort: str = "name"
+    descending: bool = False
+    name_filter: str | None = None
+    cursor: Tuple[Any, ...] | None = None
+    direction: Direction = "after"
+    limit: int = PAGE_SIZE
+
+    @property
+    def backwards(self) -> bool:
+        """Whether the page is walked backwards from the cursor."""
+        return self.direction == "before"
+
+    @property
+    def ascending(self) -> bool:
+        """Whether the rows are read in ascending order."""
+        return self.descending == self.backwards
+
+
+def _sort_key(table: sa.Table, sort: str) -> sa.ColumnElement:
+    """Return the sort expression, with NULLs mapped to a comparable value.
+
+    Args:
+        table (sa.Table): ingredients table
+        sort (str): key of SORT_KEYS
+
+    Raises:
+        KeyError: Unknown sort key.
+
+    Returns:
+        sa.ColumnElement: sort expression
+    """
+    if sort not in SORT_KEYS:
+        raise KeyError(f"Unknown sort key {sort}.")
+    column, default = SORT_KEYS[sort]
+    # Rendered inline so the expression matches the sort indexes.
+    return sa.func.coalesce(
+        table.c[column], sa.literal(default, literal_execute=True)
+    )
+
+
+def _row_key(base: sa.Select) -> sa.Tuple:
+    """Return the (sort key, id) tuple the pages are ordered by.
+
+    Args:
+        base (sa.Select): ingredients query with sort_key and id columns
+
+    Returns:
+        sa.Tuple: row key expression
+    """
+    columns = base.selected_columns
+    return sa.tuple_(columns.sort_key, columns.id)
+
+
+def _ordered(
+    columns: Sequence[sa.ColumnElement], ascending: bool
+) -> List[sa.ColumnElement]:
+    """Apply a sort direction to order by columns.
+
+    Args:
+        columns (Sequence[sa.ColumnElement]): order by columns
+        ascending (bool): sort ascending
+
+    Returns:
+        List[sa.ColumnElement]: columns in the given direction
+    """
+    return [col if ascending else col.desc() for col in columns]
+
+
+def _page_rows(base: sa.Select, query: PageQuery) -> sa.Select:
+    """Order the rows and restrict them to the window of a page.
+
+    One row more than the page holds is selected, it tells whether there
+    are further rows in reading direction.
+
+    Args:
+        base (sa.Select): filtered ingredients with sort_key and id columns
+        query (PageQuery): sort order and position of the page
+
+    Returns:
+        sa.Select: rows of the page in reading order
+    """
+    row_key = _row_key(base)
+    columns = base.selected_columns
+    stmt = base.order_by(
+        *_ordered((columns.sort_key, columns.id), query.ascending)
+    )
+    if query.cursor is not None:
+        bound = sa.tuple_(*query.cursor)
+        if query.direction == "at":
+            stmt = stmt.where(
+                row_key <= bound if query.descending else row_key >= bound
+            )
+        else:
+            stmt = stmt.where(
+                row_key > bound if query.ascending else row_key < bound
+            )
+    return stmt.limit(query.limit + 1)
+
+
+def _has_rows_before(
+    conn: sa.Connection, base: sa.Select, first: List[Any], descending: bool
+) -> bool:
+    """Check if any row precedes the first row of a page.
+
+    Args:
+        conn (sa.Connection): db connection
+        base (sa.Select): filtered ingredients with sort_key and id columns
+        first (List[Any]): [sort value, id] of the first row of the page
+        descending (bool): the pages are sorted descending
+
+    Returns:
+        bool: True if there is a previous page
+    """
+    row_key, before = _row_key(base), sa.tuple_(*first)
+    stmt = base.where(row_key > before if descending else row_key < before)
+    return conn.execute(stmt.limit(1)).first() is not None
+
+
+def _bounds(items: pd.DataFrame) -> Tuple[List[Any], List[Any]]:
+    """Return the cursors of the first and the last row of a page.
+
+    Args:
+        items (pd.DataFrame): rows of the page with sort_key and id columns
+
+    Returns:
+        Tuple[List[Any], List[Any]]: [sort value, id] of both rows
+    """
+    keys, ids = items["sort_key"].tolist(), items["id"].tolist()
+    return [keys[0], ids[0]], [keys[-1], ids[-1]]
+
+
+def fetch_inventory_page(
+    handler: SQLHandler,
+    query: PageQuery = PageQuery(),
+    ingredient_ids: Sequence[int] | None = None,
+    excluded_ids: Sequence[int] | None = None,
+) -> InventoryPage:
+    """Fetch one page of ingredients with their tags.
+
+    Sorting, filtering and paging all run in SQLite, so the cost of a page
+    does not depend on the size of the inventory.
+
+    Args:
+        handler (SQLHandler): handler connected to the food db
+        query (PageQuery): sort order, name filter and position of the page.
+            Defaults to the first page sorted by name.
+        ingredient_ids (Sequence[int] | None): restrict the inventory to
+            these ingredients, e.g. the result of a tag query.
+        excluded_ids (Sequence[int] | None): leave out these ingredients.
+
+    Returns:
+        InventoryPage: ingredients of the page with a list of tag names
+        each, and the cursors of the page
+    """
+    ingredients = handler.get_table("ingredients")
+    base = sa.select(
+        ingredients.c.id,
+        ingredients.c.ingredient_name,
+        ingredients.c.inventory_amount,
+        _sort_key(ingredients, query.sort).label("sort_key"),
+    )
+    if query.name_filter:
+        base = base.where(
+            ingredients.c.ingredient_name.contains(
+                query.name_filter, autoescape=True
+            )
+        )
+    # One json parameter instead of a bound parameter per id.
+    if ingredient_ids is not None:
+        base = base.where(ingredients.c.id.in_(_id_list(ingredient_ids)))
+    if excluded_ids is not None:
+        base = base.where(ingredients.c.id.not_in(_id_list(excluded_ids)))
+
+    # Walking backwards flips the order, the page is reversed afterwards.
+    page_rows = _page_rows(base, query).subquery("page")
+    page_stmt = with_tag_names(handler, page_rows).order_by(
+        *_ordered((page_rows.c.sort_key, page_rows.c.id), query.ascending)
+    )
+
+    with handler.engine.connect() as conn:
+        items = _split_tag_names(pd.read_sql(page_stmt, conn))
+        has_more = len(items) > query.limit
+        items = items.iloc[: query.limit]
+        if query.backwards:
+            items = items.iloc[::-1].reset_index(drop=True)
+        if items.empty:
+            return InventoryPage(items, None, None, False, False)
+        first, last = _bounds(items)
+        has_prev = (
+            has_more
+            if query.backwards
+            else _has_rows_before(conn, base, first, query.descending)
+        )
+
+    items = items.drop(columns="sort_key")
+    return InventoryPage(
+        items, first, last, has_prev, query.backwards or has_more
+    )
+
+
+def _id_list(ids: Sequence[int]) -> sa.Select:
+    """Select a list of ids passed as one json parameter.
+
+    Args:
+        ids (Sequence[int]): ids
+
+    Returns:
+        sa.Select: one row per id
+    """
+    values = sa.func.json_each(json.dumps([int(i) for i in ids]))
+    return sa.select(values.table_valued("value").c.value)
+
+
+def with_tag_names(handler: SQLHandler, items: sa.Subquery) -> sa.Select:
+    """Join the tag names onto a set of ingredients, one row per ingredient.
+
+    Args:
+        handler (SQLHandler): handler connected to the food db
+        items (sa.Subquery): ingredients, must contain an id column
+
+    Returns:
+        sa.Select: all columns of items plus the aggregated tag_names
+    """
+    ingredient_tags = handler.get_table("ingredient_tags")
+    tags = handler.get_table("tags")
+    return (
+        sa.select(
+            items,
+            sa.func.group_concat(tags.c.tag_name, TAG_SEPARATOR).label(
+                "tag_names"
+            ),
+        )
+        .outerjoin(
+            ingredient_tags, ingredient_tags.c.ingredient_id == items.c.id
+        )
+        .outerjoin(tags, tags.c.id == ingredient_tags.c.tag_id)
+        .group_by(items.c.id)
+    )
+
+
+def read_inventory(handler: SQLHandler) -> pd.DataFrame:
+    """Read the whole inventory with the tag names of every ingredient.
+
+    Args:
+        handler (SQLHandler): handler connected to the food db
+
+    Returns:
+        pd.DataFrame: id, ingredient_name, inventory_amount and tag_names
+    """
+    ingredients = handler.get_table("ingredients")
+    items = sa.select(
+        ingredients.c.id,
+        ingredients.c.ingredient_name,
+        ingredients.c.inventory_amount,
+    ).subquery("items")
+    stmt = with_tag_names(handler, items).order_by(items.c.id)
+    with handler.engine.connect() as conn:
+        return _split_tag_names(pd.read_sql(stmt, conn))
+
+
+def _split_tag_names(items: pd.DataFrame) -> pd.DataFrame:
+    """Turn the concatenated tag names into lists.
+
+    Args:
+        items (pd.DataFrame): query result with a tag_names column
+
+    Returns:
+        pd.DataFrame: items with a list of tag names per row
+    """
+    items["tag_names"] = [
+        names.split(TAG_SEPARATOR) if isinstance(names, str) else []
+        for names in items["tag_names"]
+    ]
+    return items
@@ -0,0 +1,110 @@
+"""
+This module contains a bounded LRU cache for values derived from a database.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+MAX_SIZE = 256
+
+
+class MemoCache:
+    """Memoize values per database, evicting the least recently used."""
+
+    def __init__(
+        self,
+        max_size: int = MAX_SIZE,
+        sizeof: Callable[[Any], int] | None = None,
+    ) -> None:
+        """Initialize the class.
+
+        Args:
+            max_size (int): total size of all entries. Defaults to MAX_SIZE.
+            sizeof (Callable[[Any], int] | None): size of a value, every
+                value counts as 1 if None.
+        """
+        self.max_size = max_size
+        self.sizeof = sizeof or (lambda _: 1)
+        self._entries: OrderedDict[
+            Tuple[Path, Hashable], Tuple[Any, int]
+        ] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # Hits, misses and evictions.
+        self._counts: Counter[str] = Counter()
+
+    def get_or_create(
+        self, db_path: Path | str, key: Hashable, create: Callable[[], Any]
+    ) -> Any:
+        """Return the cached value of a key, creating it on a miss.
+
+        The key must identify the data the value is derived from, e.g. by
+        the table versions of the change tracker.
+
+        Args:
+            db_path (Path | str): path to db file the value derives from
+            key (Hashable): key of the value within the db
+            create (Callable[[], Any]): builds the value on a miss
+
+        Returns:
+            Any: cached or newly created value, shared between callers
+        """
+        entry_key = (Path(db_path).expanduser().resolve(), key)
+        with self._lock:
+            if entry_key in self._entries:
+                self._entries.move_to_end(entry_key)
+                self._counts["hits"] += 1
+                return self._entries[entry_key][0]
+            self._counts["misses"] += 1
+        # Build outside the lock, concurrent misses may build twice.
+        value = create()
+        size = self.sizeof(value)
+        with self._lock:
+            if entry_key in self._entries:
+                self._size -= self._entries.pop(entry_key)[1]
+            self._entries[entry_key] = (value, size)
+            self._size += size
+            while self._size > self.max_size and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._counts["evictions"] += 1
+        return value
+
+    def invalidate(self, db_path: Path | str | None = None) -> None:
+        """Drop cached values.
+
+        Args:
+            db_path (Path | str | None): db whose values are dropped, all
+                dbs if None.
+        """
+        with self._lock:
+            if db_path is None:
+                self._entries.clear()
+                self._size = 0
+                return
+            db_key = Path(db_path).expanduser().resolve()
+            for entry_key in [k for k in self._entries if k[0] == db_key]:
+                self._size -= self._entries.pop(entry_key)[1]
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache counters.
+
+        Returns:
+            Dict[str, int]: hits, misses, evictions, entries and size
+        """
+        with self._lock:
+            return {
+                "hits": self._counts["hits"],
+                "misses": self._counts["misses"],
+                "evictions": self._counts["evictions"],
+                "entries": len(self._entries),
+                "size": self._size,
+            }
+
+
+memo_cache = MemoCache()
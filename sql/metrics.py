@@ -0,0 +1,233 @@
+"""
+This module contains histograms rendered in the Prometheus text format.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import bisect
+import os
+import threading
+import time
+from typing import Any, Dict, List, Literal, Tuple
+
+import sqlalchemy as sa
+
+MetricsMode = Literal["off", "low", "full"]
+TIME_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (1e2, 1e3, 1e4, 1e5, 1e6, 1e7)
+# In low mode payload sizes are measured for one call out of this many.
+SAMPLE_EVERY = 20
+
+
+class Histogram:
+    """Cumulative histogram with one series per combination of labels."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Tuple[float, ...],
+        label_names: Tuple[str, ...] = (),
+    ) -> None:
+        """Initialize the class.
+
+        Args:
+            name (str): metric name
+            documentation (str): help text of the metric
+            buckets (Tuple[float, ...]): sorted upper bounds of the buckets
+            label_names (Tuple[str, ...]): names of the labels
+        """
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        # Per series: counts per bucket (last one is +Inf) and value sum.
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one value.
+
+        Args:
+            value (float): observed value
+            labels (str): label values in the order of label_names
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[labels] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> List[str]:
+        """Render the histogram in the Prometheus text format.
+
+        Returns:
+            List[str]: lines of the exposition format
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = {
+                labels: (list(counts), total[0])
+                for labels, (counts, total) in self._series.items()
+            }
+        for labels, (counts, total) in sorted(series.items()):
+            label_text = ",".join(
+                f'{name}="{_escape(value)}"'
+                for name, value in zip(self.label_names, labels)
+            )
+            cumulative = 0
+            bounds = [repr(float(b)) for b in self.buckets] + ["+Inf"]
+            prefix = f"{label_text}," if label_text else ""
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+                )
+            suffix = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format.
+
+    Args:
+        value (str): label value
+
+    Returns:
+        str: escaped label value
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Collect the histograms of the process and time sql statements."""
+
+    def __init__(self, mode: MetricsMode = "low") -> None:
+        """Initialize the class.
+
+        Args:
+            mode (MetricsMode): "off" records nothing, "low" samples the
+                payload sizes, "full" measures every payload. Timings are
+                recorded in both "low" and "full".
+        """
+        assert mode in ("off", "low", "full")
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self.query_seconds = self.histogram(
+            "sql_query_duration_seconds",
+            "Duration of sql statements by operation.",
+            TIME_BUCKETS,
+            ("operation",),
+        )
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Tuple[float, ...],
+        label_names: Tuple[str, ...] = (),
+    ) -> Histogram:
+        """Get a histogram, creating it on first use.
+
+        Args:
+            name (str): metric name
+            documentation (str): help text of the metric
+            buckets (Tuple[float, ...]): sorted upper bounds of the buckets
+            label_names (Tuple[str, ...]): names of the labels
+
+        Returns:
+            Histogram: histogram registered under the name
+        """
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = Histogram(
+                    name, documentation, buckets, label_names
+                )
+            return self._histograms[name]
+
+    def render(self) -> str:
+        """Render all histograms in the Prometheus text format.
+
+        Returns:
+            str: exposition text
+        """
+        with self._lock:
+            histograms = list(self._histograms.values())
+        lines = [line for hist in histograms for line in hist.render()]
+        return "\n".join(lines) + "\n"
+
+    def instrument_engine(self, engine: sa.Engine) -> None:
+        """Time every statement run on an engine.
+
+        Args:
+            engine (sa.Engine): engine to instrument
+        """
+        sa.event.listen(engine, "before_cursor_execute", _before_execute)
+        sa.event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def _after_execute(
+        self,
+        conn: sa.Connection,
+        _cursor: Any,
+        statement: str,
+        *_: Any,
+    ) -> None:
+        """Record the duration of a finished statement.
+
+        Args:
+            conn (sa.Connection): connection the statement ran on
+            _cursor (Any): dbapi cursor
+            statement (str): sql text
+        """
+        start = conn.info.pop("query_start", None)
+        if start is None or self.mode == "off":
+            return
+        elapsed = time.perf_counter() - start
+        operation = statement.lstrip().split(None, 1)[0].upper()
+        self.query_seconds.observe(elapsed, operation)
+
+
+def _before_execute(conn: sa.Connection, *_: Any) -> None:
+    """Remember the start time of a statement.
+
+    Args:
+        conn (sa.Connection): connection the statement runs on
+    """
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _mode_from_env() -> MetricsMode:
+    """Read the metrics mode from the environment variable METRICS_MODE.
+
+    Returns:
+        MetricsMode: configured mode, "low" if unset or unknown
+    """
+    mode = os.environ.get("METRICS_MODE", "low")
+    return mode if mode in ("off", "low", "full") else "low"  # type: ignore
+
+
+metrics = MetricsRegistry(_mode_from_env())
@@ -0,0 +1,91 @@
+"""
+This module contains a per database cache of reflected sqlite schemas.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import threading
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict
+
+import sqlalchemy as sa
+
+
+@dataclass
+class _CachedSchema:
+    """Reflected metadata together with the schema version it belongs to."""
+
+    meta: sa.MetaData = field(default_factory=sa.MetaData)
+    schema_version: int | None = None
+
+
+class SchemaCache:
+    """Reflect each database once and refresh only after schema changes."""
+
+    def __init__(self) -> None:
+        """Initialize the class."""
+        self._schemas: Dict[Path, _CachedSchema] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def schema_version(conn: sa.Connection) -> int:
+        """Read sqlite's schema cookie, which changes on every DDL statement.
+
+        Args:
+            conn (sa.Connection): db connection
+
+        Returns:
+            int: current schema version
+        """
+        return int(conn.exec_driver_sql("PRAGMA schema_version").scalar_one())
+
+    def get_metadata(
+        self, db_path: Path | str, engine: sa.Engine
+    ) -> sa.MetaData:
+        """Return the reflected metadata, reflecting again if it is stale.
+
+        Args:
+            db_path (Path | str): path to db file
+            engine (sa.Engine): engine connected to the db
+
+        Returns:
+            sa.MetaData: reflected tables and views
+        """
+        key = Path(db_path).expanduser().resolve()
+        with engine.connect() as conn:
+            version = self.schema_version(conn)
+            cached = self._schemas.get(key)
+            if cached is not None and cached.schema_version == version:
+                return cached.meta
+            with self._lock:
+                cached = self._schemas.get(key)
+                if cached is None or cached.schema_version != version:
+                    cached = _CachedSchema(schema_version=version)
+                    with warnings.catch_warnings():
+                        # Expression indexes are used by sqlite only.
+                        warnings.filterwarnings(
+                            "ignore",
+                            "Skipped unsupported reflection",
+                            sa.exc.SAWarning,
+                        )
+                        cached.meta.reflect(conn, views=True)
+                    self._schemas[key] = cached
+                return cached.meta
+
+    def invalidate(self, db_path: Path | str | None = None) -> None:
+        """Drop cached metadata so the next access reflects again.
+
+        Args:
+            db_path (Path | str | None): database to drop, defaults to all.
+        """
+        with self._lock:
+            if db_path is None:
+                self._schemas.clear()
+            else:
+                self._schemas.pop(Path(db_path).expanduser().resolve(), None)
+
+
+schema_cache = SchemaCache()
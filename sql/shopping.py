@@ -0,0 +1,168 @@
+"""
+This module contains the shopping list of a weekly meal plan.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import threading
+from pathlib import Path
+from typing import Dict, Hashable
+
+import numpy as np
+import pandas as pd
+
+from sql.feasibility import RequirementMatrix, get_feasibility
+from sql.memo_cache import memo_cache
+from sql.table_cache import get_table_cache
+
+# Tag of ingredients without any tag.
+UNTAGGED = "Other"
+# Incremental updates accumulate rounding errors, smaller amounts are zero.
+EPSILON = 1e-9
+
+
+class ShoppingPlan:
+    """Total ingredient requirements of a plan, kept up to date per meal."""
+
+    def __init__(self) -> None:
+        """Initialize the class."""
+        self.lock = threading.Lock()
+        self.matrix: RequirementMatrix | None = None
+        self.quantities: Dict[int, int] = {}
+        self.required = np.zeros(0)
+
+    def update(
+        self, matrix: RequirementMatrix, quantities: Dict[int, int]
+    ) -> np.ndarray:
+        """Bring the requirements up to date with the planned meals.
+
+        Only the meals whose quantity changed are applied, unless the
+        requirement matrix itself was rebuilt since the last update. Call
+        with the lock held.
+
+        Args:
+            matrix (RequirementMatrix): current requirements of all meals
+            quantities (Dict[int, int]): servings per meal id
+
+        Returns:
+            np.ndarray: required amount per ingredient column
+        """
+        if matrix is not self.matrix:
+            self.matrix = matrix
+            self.quantities = dict(quantities)
+            self.required = required_amounts(matrix, quantities)
+            return self.required
+        changed = {
+            meal_id: quantities.get(meal_id, 0)
+            - self.quantities.get(meal_id, 0)
+            for meal_id in set(quantities) | set(self.quantities)
+        }
+        changed = {meal_id: diff for meal_id, diff in changed.items() if diff}
+        if changed:
+            rows = matrix.meal_rows(np.array(list(changed)))
+            diffs = np.array(list(changed.values()), dtype=float)
+            known = rows >= 0
+            rows, diffs = rows[known], diffs[known]
+            entries = matrix.meal_entries(rows)
+            # One scatter-add over the entries of all changed meals.
+            np.add.at(
+                self.required,
+                matrix.cols[entries],
+                matrix.amounts[entries]
+                * np.repeat(diffs, matrix.meal_sizes(rows)),
+            )
+            self.quantities = dict(quantities)
+        return self.required
+
+    def to_buy(
+        self,
+        matrix: RequirementMatrix,
+        quantities: Dict[int, int],
+        inventory: np.ndarray,
+    ) -> pd.DataFrame:
+        """List the ingredients the stock does not cover.
+
+        Args:
+            matrix (RequirementMatrix): current requirements of all meals
+            quantities (Dict[int, int]): servings per meal id
+            inventory (np.ndarray): amount in stock per ingredient column
+
+        Returns:
+            pd.DataFrame: ingredient_id and missing amount
+        """
+        with self.lock:
+            missing = self.update(matrix, quantities) - inventory
+        cols = np.flatnonzero(missing > EPSILON)
+        return pd.DataFrame(
+            {
+                "ingredient_id": matrix.ingredient_ids[cols],
+                "amount": missing[cols],
+            }
+        )
+
+
+def required_amounts(
+    matrix: RequirementMatrix, quantities: Dict[int, int]
+) -> np.ndarray:
+    """Compute the total requirements of a plan from scratch.
+
+    Args:
+        matrix (RequirementMatrix): requirements of all meals
+        quantities (Dict[int, int]): servings per meal id
+
+    Returns:
+        np.ndarray: required amount per ingredient column
+    """
+    servings = np.zeros(len(matrix.meal_ids))
+    rows = matrix.meal_rows(np.array(list(quantities), dtype=np.int64))
+    counts = np.array(list(quantities.values()), dtype=float)
+    servings[rows[rows >= 0]] = counts[rows >= 0]
+    return np.bincount(
+        matrix.cols,
+        weights=matrix.amounts * servings[matrix.rows],
+        minlength=len(matrix.ingredient_ids),
+    )
+
+
+def shopping_list(
+    db_path: Path | str, plan_id: Hashable, quantities: Dict[int, int]
+) -> pd.DataFrame:
+    """List what to buy for a plan, grouped by tag.
+
+    The requirements of a plan are memoized under its id, so editing one
+    meal of the plan only applies the change of that meal.
+
+    Args:
+        db_path (Path | str): path to db file
+        plan_id (Hashable): id of the plan
+        quantities (Dict[int, int]): servings per meal id
+
+    Returns:
+        pd.DataFrame: tag_name, ingredient_name and amount to buy, an
+        ingredient with several tags is listed under each of them
+    """
+    matrix, inventory = get_feasibility(db_path).snapshot()
+    plan = memo_cache.get_or_create(
+        db_path, ("shopping_plan", plan_id), ShoppingPlan
+    )
+    to_buy = plan.to_buy(matrix, quantities, inventory)
+    table_cache = get_table_cache(db_path)
+    ingredients = table_cache.frame("ingredients")[["id", "ingredient_name"]]
+    links = table_cache.frame("ingredient_tags")
+    tags = (
+        links[links["ingredient_id"].isin(to_buy["ingredient_id"])]
+        .merge(table_cache.frame("tags"), left_on="tag_id", right_on="id")
+        .loc[:, ["ingredient_id", "tag_name"]]
+    )
+    result = (
+        to_buy.merge(ingredients, left_on="ingredient_id", right_on="id")
+        .merge(tags, on="ingredient_id", how="left")
+        .fillna({"tag_name": UNTAGGED})
+    )
+    totals: pd.DataFrame = result.groupby(
+        ["tag_name", "ingredient_name"], as_index=False
+    ).agg(amount=("amount", "sum"))
+    return totals.sort_values(
+        ["tag_name", "ingredient_name"], ignore_index=True
+    )
@@ -5,12 +5,53 @@ Author: Jonas Schrage
 Date: 17.04.2023
 
 """
+import operator
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal
+from typing import Any, Callable, Dict, Iterator, List, Literal, Tuple
 
 import pandas as pd
 import sqlalchemy as sa
 
+from sql.autocomplete import get_search_index
+from sql.change_tracker import get_tracker
+from sql.engine_registry import get_engine
+from sql.memo_cache import memo_cache
+from sql.schema_cache import schema_cache
+
+Filters = Dict[str, Any] | List[Tuple[str, str, Any]]
+FILTER_OPERATORS: Dict[str, Callable[[sa.Column, Any], sa.ColumnElement]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda column, values: column.in_(values),
+    "not in": lambda column, values: column.not_in(values),
+    "like": lambda column, pattern: column.like(pattern),
+}
+
+
+@dataclass(frozen=True)
+class ReadOptions:
+    """Projection, filters, ordering and limit of a table read.
+
+    Attributes:
+        columns (List[str] | None): columns to read, defaults to all.
+        filters (Filters | None): {column: value} for equality,
+            {column: [values]} for IN, or (column, operator, value) tuples
+            with an operator of FILTER_OPERATORS.
+        order_by (List[str] | None): columns to order by, a leading "-"
+            sorts descending.
+        limit (int | None): maximum number of rows.
+    """
+
+    columns: List[str] | None = None
+    filters: Filters | None = None
+    order_by: List[str] | None = None
+    limit: int | None = None
+
 
 class SQLHandler:
     """Connect and query databases."""
@@ -28,14 +69,44 @@ class SQLHandler:
         """
         self.db_path = Path(db_path)
         self.table = table
-        self.meta = sa.MetaData()
 
-        self.engine = sa.create_engine(f"sqlite:///{self.db_path}")
-        self.meta.reflect(self.engine, views=True)
+        self.engine = get_engine(self.db_path)
         self.sqltable = None
         if self.table is not None:
             self.sqltable = self.get_table()
 
+    @property
+    def meta(self) -> sa.MetaData:
+        """Reflected metadata of the db, shared with other handlers.
+
+        Returns:
+            sa.MetaData: cached metadata, refreshed after schema changes
+        """
+        return schema_cache.get_metadata(self.db_path, self.engine)
+
+    def invalidate_schema(self) -> None:
+        """Force the next metadata access to reflect the db again."""
+        schema_cache.invalidate(self.db_path)
+
+    def create_all(self, metadata: sa.MetaData) -> None:
+        """Create all tables of the given metadata that do not exist yet.
+
+        Args:
+            metadata (sa.MetaData): table definitions to create
+        """
+        metadata.create_all(self.engine)
+        self.invalidate_schema()
+
+    def execute_ddl(self, statement: str) -> None:
+        """Run a DDL statement and invalidate the cached schema.
+
+        Args:
+            statement (str): DDL statement, e.g. CREATE INDEX
+        """
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(statement)
+        self.invalidate_schema()
+
     def get_table(self, table_name: str | None = None) -> sa.Table:
         """Get a table from the sqlite db.
 
@@ -49,27 +120,144 @@ class SQLHandler:
             sa.Table: table from sqlite db
         """
         table = table_name or self.table
-        if f"{table}" in self.meta.tables:
-            return self.meta.tables[f"{table}"]
+        tables = self.meta.tables
+        if f"{table}" in tables:
+            return tables[f"{table}"]
         raise KeyError(f"Table {table} does not exist.")
 
-    def read_table(self, table_name: str | None = None) -> pd.DataFrame:
+    @staticmethod
+    def _column(table: sa.Table, name: str) -> sa.Column:
+        """Get a column of a table.
+
+        Args:
+            table (sa.Table): table
+            name (str): column name
+
+        Raises:
+            KeyError: Column doesnt exist.
+
+        Returns:
+            sa.Column: column of the table
+        """
+        if name not in table.c:
+            raise KeyError(f"Table {table.name} has no column {name}.")
+        return table.c[name]
+
+    def _target(self, table_name: str | None) -> sa.Table:
+        """Resolve the table an operation works on.
+
+        A given table name always wins. Without one, the table of the
+        handler is used, which is the first table used if none was passed
+        on creation.
+
+        Args:
+            table_name (str | None): table name
+
+        Raises:
+            KeyError: No table name given or table doesnt exist.
+
+        Returns:
+            sa.Table: current definition of the table
+        """
+        if table_name is None:
+            if self.sqltable is None:
+                raise KeyError("No table name given.")
+            table_name = self.sqltable.name
+        # Resolve through the schema cache so a replaced table is picked up.
+        table = self.get_table(table_name)
+        if self.sqltable is None or self.sqltable.name == table.name:
+            self.sqltable = table
+        return table
+
+    def build_select(
+        self,
+        table_name: str | None = None,
+        options: ReadOptions = ReadOptions(),
+    ) -> sa.Select:
+        """Build a SELECT with projection, filters, ordering and limit.
+
+        Args:
+            table_name (str | None): table name, defaults to the table of the
+                handler.
+            options (ReadOptions): columns, filters, ordering and limit.
+                Defaults to all rows and columns.
+
+        Raises:
+            KeyError: Unknown table, column or filter operator.
+
+        Returns:
+            sa.Select: statement on the table
+        """
+        table = self._target(table_name)
+        column = self._column
+        stmt = (
+            sa.select(*(column(table, name) for name in options.columns))
+            if options.columns
+            else sa.select(table)
+        )
+        filters = options.filters
+        if isinstance(filters, dict):
+            filters = [
+                (name, "in" if isinstance(value, list) else "==", value)
+                for name, value in filters.items()
+            ]
+        for name, op_name, value in filters or []:
+            if op_name not in FILTER_OPERATORS:
+                raise KeyError(f"Unknown filter operator {op_name}.")
+            stmt = stmt.where(
+                FILTER_OPERATORS[op_name](column(table, name), value)
+            )
+        for name in options.order_by or []:
+            if name.startswith("-"):
+                stmt = stmt.order_by(column(table, name[1:]).desc())
+            else:
+                stmt = stmt.order_by(column(table, name))
+        if options.limit is not None:
+            stmt = stmt.limit(options.limit)
+        return stmt
+
+    def read_table(
+        self,
+        table_name: str | None = None,
+        options: ReadOptions = ReadOptions(),
+    ) -> pd.DataFrame:
         """Read table or view from SQL server.
 
         Args:
-            table_name (str | None, optional): table name. Defaults to None.
+            table_name (str | None, optional): table name, defaults to the
+                table of the handler.
+            options (ReadOptions): columns, filters, ordering and limit, see
+                build_select. Defaults to all rows and columns.
 
         Returns:
             pd.DataFrame: Dataframe with data from sql table
         """
-        if self.sqltable is None:
-            assert table_name
-            self.sqltable = self.get_table(table_name)
-        self.meta.reflect(self.engine, views=True)
-        stmt = sa.select(self.sqltable)
+        stmt = self.build_select(table_name, options)
         return_df = pd.read_sql(stmt, self.engine)
         return return_df
 
+    def iter_table(
+        self,
+        chunksize: int,
+        table_name: str | None = None,
+        options: ReadOptions = ReadOptions(),
+    ) -> Iterator[pd.DataFrame]:
+        """Read table or view in chunks without materializing all rows.
+
+        Args:
+            chunksize (int): rows per chunk
+            table_name (str | None, optional): table name, defaults to the
+                table of the handler.
+            options (ReadOptions): columns, filters, ordering and limit, see
+                build_select. Defaults to all rows and columns.
+
+        Yields:
+            Iterator[pd.DataFrame]: chunks of at most chunksize rows
+        """
+        stmt = self.build_select(table_name, options)
+        with self.engine.connect() as conn:
+            yield from pd.read_sql(stmt, conn, chunksize=chunksize)
+
     def write_table(
         self,
         upload_df: pd.DataFrame,
@@ -80,17 +268,24 @@ class SQLHandler:
 
         Args:
             upload_df (pd.DataFrame): Dataframe to write to SQL database.
-            table_name (str | None): table name, defaults to None.
+            table_name (str | None): table name, defaults to the table of
+                the handler.
             if_exists (Literal["replace","append","fail"], optional): Behaviour
             if table exists already. Defaults to "fail".
         """
         assert if_exists in ["replace", "append", "fail"]
-        if self.sqltable is None:
-            assert table_name
-            self.sqltable = self.get_table(table_name)
+        name = self._target(table_name).name
         upload_df.reset_index(drop=True).to_sql(
-            self.sqltable.name,
+            name,
             self.engine,
             if_exists=if_exists,
             index=False,
         )
+        # Values derived from the old rows must not be served anymore.
+        memo_cache.invalidate(self.db_path)
+        if if_exists == "replace":
+            # Replacing drops the table together with its change and search
+            # triggers.
+            self.invalidate_schema()
+            get_tracker(self.db_path).bump(name)
+            get_search_index(self.db_path).rebuild(name)
@@ -0,0 +1,229 @@
+"""
+This module contains a server side cache of whole tables keyed by version.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from sql.change_tracker import TableDelta, get_tracker
+
+
+@dataclass
+class CachedTable:
+    """A table frame together with the version it was read at."""
+
+    version: int
+    key: List[str]
+    frame: pd.DataFrame
+
+
+class DiskBackend:
+    """Share cached tables between worker processes through a directory.
+
+    Entries are pickled, the directory must only be writable by the app.
+    """
+
+    def __init__(self, directory: Path | str) -> None:
+        """Initialize the class.
+
+        Args:
+            directory (Path | str): directory shared by all workers
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, db_path: Path, table_name: str) -> Path:
+        """Get the file of a cached table.
+
+        Args:
+            db_path (Path): resolved path to db file
+            table_name (str): table name
+
+        Returns:
+            Path: cache file
+        """
+        digest = hashlib.sha1(str(db_path).encode()).hexdigest()[:12]
+        return self.directory / f"{digest}_{table_name}.pkl"
+
+    def get(self, db_path: Path, table_name: str) -> CachedTable | None:
+        """Read a cached table.
+
+        Args:
+            db_path (Path): resolved path to db file
+            table_name (str): table name
+
+        Returns:
+            CachedTable | None: cached table, None if not cached
+        """
+        try:
+            with open(self._path(db_path, table_name), "rb") as file:
+                entry = pickle.load(file)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        return entry if isinstance(entry, CachedTable) else None
+
+    def set(self, db_path: Path, table_name: str, entry: CachedTable) -> None:
+        """Write a cached table, replacing the file atomically.
+
+        Args:
+            db_path (Path): resolved path to db file
+            table_name (str): table name
+            entry (CachedTable): table to cache
+        """
+        handle, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as file:
+            pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, self._path(db_path, table_name))
+
+
+def apply_delta(frame: pd.DataFrame | None, delta: TableDelta) -> pd.DataFrame:
+    """Merge the changed rows of a table into a cached frame.
+
+    Args:
+        frame (pd.DataFrame | None): cached rows, None if nothing is cached
+        delta (TableDelta): changed rows and deleted keys
+
+    Returns:
+        pd.DataFrame: rows of the table at the version of the delta
+    """
+    if frame is None or delta.full:
+        return delta.upserts
+    changed = set(map(tuple, delta.deletes))
+    changed.update(delta.upserts[delta.key].itertuples(index=False, name=None))
+    if not changed:
+        return frame
+    keep = ~pd.MultiIndex.from_frame(frame[delta.key]).isin(list(changed))
+    kept: pd.DataFrame = frame.loc[keep]
+    return pd.concat([kept, delta.upserts], ignore_index=True)
+
+
+class TableCache:
+    """Resolve table version tokens to frames held on the server."""
+
+    def __init__(
+        self, db_path: Path | str, backend: DiskBackend | None = None
+    ) -> None:
+        """Initialize the class.
+
+        Args:
+            db_path (Path | str): path to db file
+            backend (DiskBackend | None): shared second level cache, only
+                the process memory is used if None.
+        """
+        self.db_path = Path(db_path).expanduser().resolve()
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._tables: Dict[str, CachedTable] = {}
+
+    def frame(
+        self, table_name: str, version: int | None = None
+    ) -> pd.DataFrame:
+        """Get the rows of a table.
+
+        A token equal to the cached version is answered without touching
+        the db. Otherwise the cache is brought up to the current version,
+        applying only the rows changed since the cached version.
+
+        Args:
+            table_name (str): table name
+            version (int | None): version token held by the client
+
+        Returns:
+            pd.DataFrame: rows of the table, shared and not to be modified
+        """
+        entry = self._tables.get(table_name)
+        if (
+            entry is not None
+            and version is not None
+            and entry.version == version
+        ):
+            return entry.frame
+        with self._lock:
+            tracker = get_tracker(self.db_path)
+            current = tracker.table_version(table_name)
+            entry = self._tables.get(table_name)
+            if entry is None or entry.version != current:
+                shared = self._from_backend(table_name)
+                if shared is not None and (
+                    entry is None or shared.version > entry.version
+                ):
+                    entry = shared
+            if entry is None or entry.version != current:
+                delta = tracker.delta(
+                    table_name, None if entry is None else entry.version
+                )
+                entry = CachedTable(
+                    delta.version,
+                    delta.key,
+                    apply_delta(None if entry is None else entry.frame, delta),
+                )
+                if self.backend is not None:
+                    self.backend.set(self.db_path, table_name, entry)
+            self._tables[table_name] = entry
+            return entry.frame
+
+    def _from_backend(self, table_name: str) -> CachedTable | None:
+        """Read a table another worker may have cached.
+
+        Args:
+            table_name (str): table name
+
+        Returns:
+            CachedTable | None: cached table, None without backend or entry
+        """
+        if self.backend is None:
+            return None
+        return self.backend.get(self.db_path, table_name)
+
+    def invalidate(self, table_name: str | None = None) -> None:
+        """Drop cached tables of this process.
+
+        Args:
+            table_name (str | None): table to drop, all tables if None.
+        """
+        with self._lock:
+            if table_name is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(table_name, None)
+
+
+_caches: Dict[Path, TableCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_table_cache(db_path: Path | str) -> TableCache:
+    """Return the process wide table cache for a database.
+
+    The shared on-disk backend is used if the environment variable
+    TABLE_CACHE_DIR names a directory.
+
+    Args:
+        db_path (Path | str): path to db file
+
+    Returns:
+        TableCache: shared cache
+    """
+    key = Path(db_path).expanduser().resolve()
+    cache = _caches.get(key)
+    if cache is not None:
+        return cache
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            directory = os.environ.get("TABLE_CACHE_DIR")
+            backend = DiskBackend(directory) if directory else None
+            cache = TableCache(key, backend)
+            _caches[key] = cache
+        return cache
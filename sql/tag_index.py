@@ -0,0 +1,295 @@
+"""
+This module contains an in-memory inverted index from tags to ingredients.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Literal, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sql.change_tracker import TableDelta, get_tracker
+
+WORD_BITS = 64
+# Require all tags of a query (AND) or at least one of them (OR).
+TagMode = Literal["all", "any"]
+
+
+def _set_bits(bits: np.ndarray, ids: np.ndarray, value: bool) -> None:
+    """Set or clear the bits of ids in a bitset.
+
+    Args:
+        bits (np.ndarray): bitset as uint64 words
+        ids (np.ndarray): bit positions
+        value (bool): set if True, clear if False
+    """
+    ids = np.asarray(ids, dtype=np.uint64)
+    masks = np.left_shift(np.uint64(1), ids % np.uint64(WORD_BITS))
+    words = (ids // np.uint64(WORD_BITS)).astype(np.int64)
+    if value:
+        np.bitwise_or.at(bits, words, masks)
+    else:
+        np.bitwise_and.at(bits, words, ~masks)
+
+
+def bitset_ids(bits: np.ndarray) -> np.ndarray:
+    """Return the positions of the set bits.
+
+    Args:
+        bits (np.ndarray): bitset as uint64 words
+
+    Returns:
+        np.ndarray: sorted ids
+    """
+    flags = np.unpackbits(bits.view(np.uint8), bitorder="little")
+    return np.flatnonzero(flags)
+
+
+@dataclass(frozen=True)
+class TagQuery:
+    """Tag names the ingredients must and must not carry.
+
+    Frozen, so a query can key memoized results.
+    """
+
+    tags: Tuple[str, ...] = ()
+    mode: TagMode = "all"
+    exclude: Tuple[str, ...] = ()
+
+    @property
+    def active(self) -> bool:
+        """Whether the query filters out any ingredient."""
+        return bool(self.tags or self.exclude)
+
+
+@dataclass
+class TagMatch:
+    """Result of a tag query."""
+
+    ids: np.ndarray
+    others: np.ndarray
+
+    def shorter(self) -> Tuple[np.ndarray, bool]:
+        """Return the shorter of the matching and the other ingredients.
+
+        Returns:
+            Tuple[np.ndarray, bool]: sorted ids and whether they are the
+            matching ingredients
+        """
+        if len(self.ids) <= len(self.others):
+            return self.ids, True
+        return self.others, False
+
+
+class TagIndex:
+    """Map every tag to the bitset of its ingredient ids.
+
+    Bit i of a bitset stands for the ingredient with id i. Queries combine
+    the bitsets of the tags with bitwise operations.
+    """
+
+    def __init__(self, db_path: Path | str) -> None:
+        """Initialize the class.
+
+        Args:
+            db_path (Path | str): path to db file
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._words = 0
+        self._bits: Dict[int, np.ndarray] = {}
+        self._names: Dict[int, str] = {}
+        self._universe = np.zeros(0, dtype=np.uint64)
+        self._versions: Dict[str, int] = {}
+
+    def _empty(self) -> np.ndarray:
+        """Return an empty bitset of the current capacity.
+
+        Returns:
+            np.ndarray: bitset as uint64 words
+        """
+        return np.zeros(self._words, dtype=np.uint64)
+
+    def _grow(self, max_id: int) -> None:
+        """Widen all bitsets so max_id fits.
+
+        Args:
+            max_id (int): largest id to be stored
+        """
+        words = max_id // WORD_BITS + 1
+        if words <= self._words:
+            return
+        # Grow geometrically, inserts mostly append new ids.
+        words = max(words, 2 * self._words)
+        pad = words - self._words
+        self._universe = np.pad(self._universe, (0, pad))
+        self._bits = {
+            tag_id: np.pad(bits, (0, pad))
+            for tag_id, bits in self._bits.items()
+        }
+        self._words = words
+
+    def _add_links(self, links: pd.DataFrame) -> None:
+        """Index ingredient tag links.
+
+        Args:
+            links (pd.DataFrame): ingredient_id and tag_id per link
+        """
+        if links.empty:
+            return
+        self._grow(int(links["ingredient_id"].max()))
+        links = links.sort_values("tag_id", kind="stable")
+        tag_ids, starts = np.unique(
+            links["tag_id"].to_numpy(), return_index=True
+        )
+        groups = np.split(links["ingredient_id"].to_numpy(), starts[1:])
+        for tag_id, ingredient_ids in zip(tag_ids.tolist(), groups):
+            bits = self._bits.setdefault(tag_id, self._empty())
+            _set_bits(bits, ingredient_ids, True)
+
+    def _remove_links(self, keys: List[List[int]]) -> None:
+        """Drop ingredient tag links from the index.
+
+        Args:
+            keys (List[List[int]]): [ingredient_id, tag_id] per link
+        """
+        for ingredient_id, tag_id in keys:
+            if (
+                tag_id in self._bits
+                and ingredient_id // WORD_BITS < self._words
+            ):
+                _set_bits(self._bits[tag_id], np.array([ingredient_id]), False)
+
+    def _apply(self, table_name: str, delta: TableDelta) -> None:
+        """Apply the changes of one table.
+
+        Args:
+            table_name (str): ingredients, ingredient_tags or tags
+            delta (TableDelta): changed rows of the table
+        """
+        rows = delta.upserts
+        if table_name == "tags":
+            if delta.full:
+                self._names = {}
+            for (tag_id,) in delta.deletes:
+                self._names.pop(tag_id, None)
+                self._bits.pop(tag_id, None)
+            self._names.update(zip(rows["id"].tolist(), rows["tag_name"]))
+        elif table_name == "ingredients":
+            if delta.full:
+                self._universe = self._empty()
+            if not rows.empty:
+                self._grow(int(rows["id"].max()))
+                _set_bits(self._universe, rows["id"].to_numpy(), True)
+            for (ingredient_id,) in delta.deletes:
+                if ingredient_id // WORD_BITS < self._words:
+                    _set_bits(self._universe, np.array([ingredient_id]), False)
+        else:
+            if delta.full:
+                self._bits = {}
+            self._remove_links(delta.deletes)
+            self._add_links(rows)
+
+    def refresh(self) -> None:
+        """Bring the index up to date, applying only the changed rows."""
+        tracker = get_tracker(self.db_path)
+        versions = tracker.versions()
+        tables = ("tags", "ingredients", "ingredient_tags")
+        if all(versions.get(t) == self._versions.get(t) for t in tables):
+            return
+        with self._lock:
+            known = {table: self._versions.get(table) for table in tables}
+            for table, delta in tracker.snapshot(known).items():
+                if delta is not None:
+                    self._apply(table, delta)
+                    self._versions[table] = delta.version
+
+    def _name_bits(self, names: Iterable[str]) -> List[np.ndarray]:
+        """Return one bitset per tag name.
+
+        Tags sharing a name are merged into one bitset.
+
+        Args:
+            names (Iterable[str]): tag names
+
+        Returns:
+            List[np.ndarray]: bitset per name, empty for unknown names
+        """
+        names = set(names)
+        merged = {name: self._empty() for name in names}
+        for tag_id, name in self._names.items():
+            if name in merged and tag_id in self._bits:
+                merged[name] |= self._bits[tag_id]
+        return list(merged.values())
+
+    def query(self, tag_query: TagQuery) -> TagMatch:
+        """Find the ingredients matching a tag query.
+
+        Args:
+            tag_query (TagQuery): tags to require (AND or OR, by mode) and
+                tags to exclude (NOT)
+
+        Raises:
+            KeyError: Unknown mode.
+
+        Returns:
+            TagMatch: sorted ids of the matching and of all other ingredients
+        """
+        if tag_query.mode not in ("all", "any"):
+            raise KeyError(f"Unknown tag query mode {tag_query.mode}.")
+        self.refresh()
+        with self._lock:
+            result = self._universe.copy()
+            included = self._name_bits(tag_query.tags)
+            if included:
+                if tag_query.mode == "all":
+                    for bits in included:
+                        result &= bits
+                else:
+                    result &= np.bitwise_or.reduce(included)
+            for bits in self._name_bits(tag_query.exclude):
+                result &= ~bits
+            others = self._universe & ~result
+        return TagMatch(bitset_ids(result), bitset_ids(others))
+
+
+_tag_indexes: Dict[Path, TagIndex] = {}
+_tag_indexes_lock = threading.Lock()
+
+
+def _after_fork() -> None:
+    """Reset the locks of the tag indexes in a forked child process."""
+    global _tag_indexes_lock  # pylint: disable=global-statement
+    _tag_indexes_lock = threading.Lock()
+    for tag_index in _tag_indexes.values():
+        tag_index._lock = threading.Lock()  # pylint: disable=protected-access
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def get_tag_index(db_path: Path | str) -> TagIndex:
+    """Return the process wide tag index for a database.
+
+    Args:
+        db_path (Path | str): path to db file
+
+    Returns:
+        TagIndex: shared index, built on first use
+    """
+    key = Path(db_path).expanduser().resolve()
+    tag_index = _tag_indexes.get(key)
+    if tag_index is not None:
+        return tag_index
+    with _tag_indexes_lock:
+        tag_index = _tag_indexes.get(key)
+        if tag_index is None:
+            tag_index = TagIndex(key)
+            _tag_indexes[key] = tag_index
+        return tag_index
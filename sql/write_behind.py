@@ -0,0 +1,238 @@
+"""
+This module contains a background writer that batches small writes.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List
+
+import sqlalchemy as sa
+
+from sql.sql_handler import SQLHandler
+
+MAX_DELAY = 0.005
+MAX_BATCH = 500
+
+
+@dataclass
+class _Write:
+    """One pending insert or update together with its future."""
+
+    table_name: str
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    values: Dict[str, Any] | None = None
+    where: Dict[str, Any] | None = None
+    future: Future = field(default_factory=Future)
+
+
+class WriteBehindQueue:
+    """Commit writes from all callers together in one transaction."""
+
+    def __init__(
+        self,
+        db_path: Path | str,
+        max_delay: float = MAX_DELAY,
+        max_batch: int = MAX_BATCH,
+    ) -> None:
+        """Initialize the class and start the writer thread.
+
+        Args:
+            db_path (Path | str): path to db file
+            max_delay (float): seconds a batch waits for more writes.
+            max_batch (int): writes committed in one transaction at most.
+        """
+        self.handler = SQLHandler(db_path)
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self._queue: queue.Queue[_Write | None] = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name=f"write-behind {db_path}", daemon=True
+        )
+        self._thread.start()
+
+    def insert(self, table_name: str, rows: List[Dict[str, Any]]) -> Future:
+        """Queue rows to insert into a table.
+
+        Args:
+            table_name (str): table name
+            rows (List[Dict[str, Any]]): rows as column to value mappings
+
+        Returns:
+            Future: resolves to the number of inserted rows once committed
+        """
+        return self._submit(_Write(table_name, rows=rows))
+
+    def update(
+        self, table_name: str, values: Dict[str, Any], where: Dict[str, Any]
+    ) -> Future:
+        """Queue an update of the rows matching all where columns.
+
+        Args:
+            table_name (str): table name
+            values (Dict[str, Any]): new column values
+            where (Dict[str, Any]): column values the rows must match
+
+        Returns:
+            Future: resolves to the number of updated rows once committed
+        """
+        return self._submit(_Write(table_name, values=values, where=where))
+
+    def close(self) -> None:
+        """Commit the pending writes and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _submit(self, write: _Write) -> Future:
+        """Put a write on the queue.
+
+        Args:
+            write (_Write): pending write
+
+        Raises:
+            RuntimeError: The queue was closed.
+
+        Returns:
+            Future: future of the write
+        """
+        if not self._thread.is_alive():
+            raise RuntimeError("The write-behind queue is closed.")
+        self._queue.put(write)
+        return write.future
+
+    def _run(self) -> None:
+        """Collect writes for up to max_delay seconds and commit them."""
+        stopping = False
+        while not stopping:
+            write = self._queue.get()
+            if write is None:
+                break
+            batch = [write]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    write = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if write is None:
+                    stopping = True
+                    break
+                batch.append(write)
+            self._commit(batch)
+
+    def _commit(self, batch: List[_Write]) -> None:
+        """Commit a batch in one transaction and resolve the futures.
+
+        If the batch fails, every write is retried in its own transaction so
+        one bad write does not fail the others. Writes whose future was
+        cancelled are dropped.
+
+        Args:
+            batch (List[_Write]): pending writes
+        """
+        # Running futures can no longer be cancelled, so resolving them
+        # cannot fail and kill the writer thread.
+        batch = [w for w in batch if w.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            # Reflect before the transaction, it needs its own connection.
+            tables = {
+                w.table_name: self.handler.get_table(w.table_name)
+                for w in batch
+            }
+            with self.handler.engine.begin() as conn:
+                results = [self._execute(conn, tables, w) for w in batch]
+        except Exception:  # pylint: disable=broad-exception-caught
+            for write in batch:
+                try:
+                    table = self.handler.get_table(write.table_name)
+                    with self.handler.engine.begin() as conn:
+                        result = self._execute(
+                            conn, {write.table_name: table}, write
+                        )
+                    write.future.set_result(result)
+                # pylint: disable-next=broad-exception-caught
+                except Exception as err:
+                    write.future.set_exception(err)
+            return
+        for write, result in zip(batch, results):
+            write.future.set_result(result)
+
+    @staticmethod
+    def _execute(
+        conn: sa.Connection, tables: Dict[str, sa.Table], write: _Write
+    ) -> int:
+        """Run one write on an open transaction.
+
+        Args:
+            conn (sa.Connection): db connection
+            tables (Dict[str, sa.Table]): tables by name
+            write (_Write): pending write
+
+        Returns:
+            int: number of affected rows
+        """
+        table = tables[write.table_name]
+        if write.values is None:
+            conn.execute(table.insert(), write.rows)
+            return len(write.rows)
+        stmt = (
+            sa.update(table)
+            .where(
+                *(
+                    table.c[col] == value
+                    for col, value in (write.where or {}).items()
+                )
+            )
+            .values(**write.values)
+        )
+        return int(conn.execute(stmt).rowcount)
+
+
+_writers: Dict[Path, WriteBehindQueue] = {}
+_writers_lock = threading.Lock()
+
+
+def _after_fork() -> None:
+    """Drop the queues in a forked child, their writer threads are gone."""
+    global _writers_lock  # pylint: disable=global-statement
+    _writers_lock = threading.Lock()
+    _writers.clear()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def get_writer(db_path: Path | str) -> WriteBehindQueue:
+    """Return the process wide write-behind queue for a database.
+
+    Args:
+        db_path (Path | str): path to db file
+
+    Returns:
+        WriteBehindQueue: shared queue, flushed at interpreter exit
+    """
+    key = Path(db_path).expanduser().resolve()
+    writer = _writers.get(key)
+    if writer is not None:
+        return writer
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = WriteBehindQueue(key)
+            atexit.register(writer.close)
+            _writers[key] = writer
+        return writer
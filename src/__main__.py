@@ -5,7 +5,56 @@ Author: Jonas Schrage
 Date: 16.04.2023
 
 """
-from src.index import app
+import argparse
+import dataclasses
+from pathlib import Path
+
+from src.config import AppConfig
+from src.index import create_app
+
+
+def main() -> None:
+    """Start the development server or the production server."""
+    parser = argparse.ArgumentParser(prog="python -m src")
+    parser.add_argument(
+        "--production",
+        action="store_true",
+        help="serve with gunicorn worker processes instead of the dev server",
+    )
+    parser.add_argument("--db", type=Path, help="path to the sqlite db")
+    parser.add_argument("--host", help="interface to bind to")
+    parser.add_argument("--port", type=int, help="port to listen on")
+    parser.add_argument("--workers", type=int, help="worker processes")
+    parser.add_argument("--threads", type=int, help="threads per worker")
+    parser.add_argument(
+        "--no-debug",
+        action="store_true",
+        help="run the dev server without debug mode and reloader",
+    )
+    args = parser.parse_args()
+
+    config = AppConfig.from_env()
+    overrides = {
+        "db_path": args.db,
+        "host": args.host,
+        "port": args.port,
+        "workers": args.workers,
+        "threads": args.threads,
+        "debug": False if args.no_debug else None,
+    }
+    config = dataclasses.replace(
+        config, **{k: v for k, v in overrides.items() if v is not None}
+    )
+
+    if args.production:
+        # pylint: disable-next=import-outside-toplevel
+        from src.serve import serve
+
+        serve(config)
+    else:
+        app = create_app(config)
+        app.run(host=config.host, port=config.port, debug=config.debug)
+
 
 if __name__ == "__main__":
-    app.run_server(debug=True, port=8050)
+    main()
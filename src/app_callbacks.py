@@ -5,16 +5,52 @@ Author: Jonas Schrage
 Date: 16.04.2023
 
 """
+import base64
+import tempfile
+import uuid
 from pathlib import Path
-from typing import Dict, List, Tuple, Union
+from typing import Any, Callable, Dict, List, Tuple, Union
 
 import dash_bootstrap_components as dbc
 import pandas as pd
-from dash import Input, Output, State, callback, ctx, html  # , dcc
-
+import sqlalchemy as sa
+from dash import Input, Output, State, callback, ctx, html, no_update
+
+from sql.autocomplete import Kind, get_search_index
+from sql.change_tracker import get_tracker
+from sql.feasibility import get_feasibility
+from sql.inventory import Direction, PageQuery, fetch_inventory_page
+from sql.memo_cache import memo_cache
+from sql.shopping import shopping_list
 from sql.sql_handler import SQLHandler
+from sql.table_cache import get_table_cache
+from sql.tag_index import TagQuery, get_tag_index
+from sql.write_behind import get_writer
+from src.background import background_callback, cache_key_sources
+from src.config import DEFAULT_DB_PATH
+from src.instrumentation import instrument
+from src.scripts import bulk_import
+
+db_path = DEFAULT_DB_PATH
+WRITE_TIMEOUT = 5
+# Tables the rendered inventory pages are derived from.
+INVENTORY_TABLES = ("ingredients", "ingredient_tags", "tags")
+# Meals listed in the "what can I cook now" section.
+FEASIBLE_ROWS = 50
+
 
-db_path = Path.cwd() / "sql" / "example.db"
+def configure(db_location: Path | str) -> None:
+    """Point the callbacks at a database.
+
+    Args:
+        db_location (Path | str): path to db file
+    """
+    global db_path  # pylint: disable=global-statement
+    db_path = Path(db_location)
+
+
+# Background results are only reused while the tables are unchanged.
+cache_key_sources.append(lambda: get_tracker(db_path).versions())
 
 
 def read_data(table_name: str) -> List:
@@ -32,56 +68,42 @@ def read_data(table_name: str) -> List:
     return result.to_dict("records")
 
 
-@callback(Output("tag_data", "data"), Input("10_min", "n_intervals"))
-def load_tags(_: int) -> List:
-    """Load tags data from database and return as a list.
-
-    Args:
-        _ (int): Unused input, required for Dash callback.
-
-    Returns:
-        A list of tag data from the database.
-    """
-    return read_data("tags")
-
-
-@callback(Output("meal_data", "data"), Input("10_min", "n_intervals"))
-def load_meals(_: int) -> List:
-    """Load meals data from database and return as a list.
-
-    Args:
-        _ (int): Unused input, required for Dash callback.
-
-    Returns:
-        A list of meal data from the database.
-    """
-    return read_data("meals")
-
-
-@callback(Output("ingredient_data", "data"), Input("10_min", "n_intervals"))
-def load_ingredients(_: int) -> List:
-    """Load ingredients data from database and return as a list.
-
-    Args:
-        _ (int): Unused input, required for Dash callback.
+STORE_TABLES = {
+    "tag_data": "tags",
+    "meal_data": "meals",
+    "ingredient_data": "ingredients",
+    "tag_ingredient_data": "ingredient_tags",
+}
 
-    Returns:
-        A list of ingredient data from the database.
-    """
-    return read_data("ingredients")
 
+@callback(
+    [Output(f"{store_id}_version", "data") for store_id in STORE_TABLES],
+    Input("10_min", "n_intervals"),
+    [State(f"{store_id}_version", "data") for store_id in STORE_TABLES],
+)
+@instrument
+def load_tables(_: int, *versions: int | None) -> List[Any]:
+    """Update the version tokens of the stored tables.
 
-@callback(Output("tag_ingredient_data", "data"), Input("10_min", "n_intervals"))
-def load_ingredient_tags(_: int) -> List:
-    """Load ingredients data from database and return as a list.
+    The stores only hold version tokens, callbacks resolve them to the
+    table rows through the server side table cache.
 
     Args:
         _ (int): Unused input, required for Dash callback.
+        versions (int | None): versions of the stored tables, Dash passes
+            one argument per state.
 
     Returns:
-        A list of ingredient data from the database.
+        The new version of every table, no_update for unchanged tables.
     """
-    return read_data("ingredient_tags")
+    current = get_tracker(db_path).versions()
+    # Keeping the index warm here leaves the inventory only the latest
+    # changes to apply.
+    get_tag_index(db_path).refresh()
+    return [
+        no_update if current.get(table) == version else current.get(table)
+        for table, version in zip(STORE_TABLES.values(), versions)
+    ]
 
 
 @callback(
@@ -89,14 +111,15 @@ def load_ingredient_tags(_: int) -> List:
     Output("multi-dropdown", "options"),
     Output("custom-tag-input", "value"),
     Input("add-tag-button", "n_clicks"),
-    Input("tag_data", "data"),
+    Input("tag_data_version", "data"),
     State("multi-dropdown", "value"),
     State("multi-dropdown", "options"),
     State("custom-tag-input", "value"),
 )
+@instrument
 def add_new_tag(
     n_clicks: Union[int, None],
-    data: List,
+    tag_version: int | None,
     value: List[str],
     options: List[Dict[str, str]],
     custom_tag: str,
@@ -106,6 +129,7 @@ def add_new_tag(
     Args:
         n_clicks (int or None): The number of times the 'add tag' button has
             been clicked.
+        tag_version (int | None): The version token of the tags.
         value (List[str]): The current list of selected tags.
         options (List[Dict[str, str]]): The current list of dropdown options.
         custom_tag (str): The custom tag entered by the user.
@@ -115,19 +139,33 @@ def add_new_tag(
         and an empty string.
     """
     value = value or []
-    if ctx.triggered_id == "tag_data":
-        options_list = pd.DataFrame(data).tag_name.unique()
+    if ctx.triggered_id == "tag_data_version":
+        tags = get_table_cache(db_path).frame("tags", tag_version)
+        options_list = tags.tag_name.unique()
         options = [{"label": item, "value": item} for item in options_list]
         return value, options, ""
     if n_clicks:
         added_tags = []
-        if custom_tag:
-            conn = SQLHandler(db_path, "tags")
+        known_tags = {option["value"] for option in options or []}
+        if custom_tag and custom_tag in known_tags:
+            # Tag names are unique, only select the existing tag.
+            if custom_tag not in value:
+                value.append(custom_tag)
+        elif custom_tag:
+            # Committed together with concurrent writes of other sessions.
+            written = get_writer(db_path).insert(
+                "tags", [{"tag_name": custom_tag}]
+            )
+            try:
+                written.result(timeout=WRITE_TIMEOUT)
+                added_tags.append(custom_tag)
+            except sa.exc.IntegrityError:
+                # The tag exists, but is not in the options of this session
+                # yet, e.g. it was just added by another session.
+                pass
             options.append({"label": custom_tag, "value": custom_tag})
-            value.append(custom_tag)
-            added_tags.append(custom_tag)
-            data_df = pd.DataFrame({"tag_name": [custom_tag]})
-            conn.write_table(data_df, if_exists="append")
+            if custom_tag not in value:
+                value.append(custom_tag)
         return value, options, ""
     return [], [], ""
 
@@ -136,6 +174,7 @@ def add_new_tag(
     Output("added-tags", "children"),
     Input("multi-dropdown", "value"),
 )
+@instrument
 def display_tags(selected_tags: List[str]) -> List[dbc.Badge] | None:
     """Display the selected tags as dbc Badges.
 
@@ -157,64 +196,491 @@ def display_items(input_df: pd.DataFrame) -> html.Table:
     """Create a html table to display the dataframe items.
 
     Args:
-        input_df (pd.DataFrame): input data
+        input_df (pd.DataFrame): ingredients with a list of tag_names each
 
     Returns:
         html.Table: data formatted into html table
     """
-    row_div = []
-    col_group = html.Colgroup([html.Col() for _ in input_df.columns])
     cols = ["Item", "Category", "Amount"]
+    col_group = html.Colgroup([html.Col() for _ in cols])
     table_head = html.Thead(html.Tr([html.Th(c) for c in cols]))
-    iter_df = input_df.loc[
-        :, ["id", "ingredient_name", "inventory_amount"]
-    ].drop_duplicates()
-    for _, content in iter_df.iterrows():
-        uid, item_name, amount = content
-        _ = uid
-        tags = input_df.query("id == @uid").loc[:, "tag_name"]
-        badges = html.Td(
-            [dbc.Badge(tag, className="tag-badge") for tag in tags]
+    row_div = [
+        html.Tr(
+            [
+                html.Td(item_name),
+                html.Td(
+                    [dbc.Badge(tag, className="tag-badge") for tag in tags]
+                ),
+                html.Td(amount),
+            ],
+            className="row-hover",
         )
-        item_txt = html.Td(item_name)
-        # item_cat = html.Td(cat)
-        item_amount = html.Td(amount)
-        row_div.append(
-            html.Tr([item_txt, badges, item_amount], className="row-hover")
+        for item_name, amount, tags in zip(
+            input_df["ingredient_name"].tolist(),
+            input_df["inventory_amount"].tolist(),
+            input_df["tag_names"],
         )
+    ]
     table_body = html.Tbody(row_div)
     return html.Table([col_group, table_head, table_body], id="inv_item_list")
 
 
+def inventory_query(
+    view: Dict[str, Any], clicks: Dict[str, int], page: Dict[str, Any]
+) -> PageQuery:
+    """Derive the page to show from the controls and the page shown.
+
+    The trigger is derived from the click counts and the view stored with
+    the page: a new view starts at the first page, more clicks than stored
+    move one page and otherwise the data changed and the page stays.
+
+    Args:
+        view (Dict[str, Any]): sort, name filter and tag filter
+        clicks (Dict[str, int]): clicks on the previous and next buttons
+        page (Dict[str, Any]): cursors, click counts and view of the page
+            currently shown
+
+    Returns:
+        PageQuery: sort order, name filter and position of the page
+    """
+    sort_key, _, order = view["sort"].partition("_")
+    cursor: List[Any] | None = None
+    direction: Direction = "after"
+    if view == page.get("view"):
+        if clicks["next_clicks"] > page.get("next_clicks", 0):
+            cursor, direction = page.get("last"), "after"
+        elif clicks["prev_clicks"] > page.get("prev_clicks", 0):
+            cursor, direction = page.get("first"), "before"
+        else:
+            cursor, direction = page.get("first"), "at"
+    return PageQuery(
+        sort=sort_key,
+        descending=order == "desc",
+        name_filter=view["filter"],
+        cursor=None if cursor is None else tuple(cursor),
+        direction=direction,
+    )
+
+
 @callback(
-    Output("inv_list", "children"),
-    Input("ingredient_data", "data"),
-    Input("tag_ingredient_data", "data"),
-    Input("tag_data", "data"),
+    output=[
+        Output("inv_list", "children"),
+        Output("inv_page", "data"),
+        Output("inv_prev", "disabled"),
+        Output("inv_next", "disabled"),
+    ],
+    inputs={
+        "_versions": [
+            Input("ingredient_data_version", "data"),
+            Input("tag_ingredient_data_version", "data"),
+            Input("tag_data_version", "data"),
+        ],
+        "view": {
+            "sort": Input("inv_sort", "value"),
+            "filter": Input("inv_filter", "value"),
+            "tags": Input("inv_tags", "value"),
+            "tag_mode": Input("inv_tag_mode", "value"),
+            "tags_not": Input("inv_tags_not", "value"),
+        },
+        "clicks": {
+            "prev_clicks": Input("inv_prev", "n_clicks"),
+            "next_clicks": Input("inv_next", "n_clicks"),
+        },
+    },
+    state={"page": State("inv_page", "data")},
 )
+@instrument
 def display_ingredient_inventory(
-    ingredient_data: List, translate: List, tags: List
-) -> List:
-    """Display the ingredient inventory in a table.
+    _versions: List[int | None],
+    view: Dict[str, Any],
+    clicks: Dict[str, int | None],
+    page: Dict[str, Any] | None,
+) -> Tuple[Any, Any, Any, Any]:
+    """Display one page of the ingredient inventory in a table.
+
+    Rendered pages are memoized by the table versions, so a page is only
+    fetched again after the data changed.
+
+    Args:
+        _versions (List[int | None]): versions of the ingredient, ingredient
+            tag and tag data, trigger the update
+        view (Dict[str, Any]): sort key and direction (e.g. "name_asc"),
+            name filter, tags to require by tag_mode and tags to exclude
+        clicks (Dict[str, int | None]): clicks on the previous and next
+            page buttons
+        page (Dict[str, Any] | None): cursors, click counts and view of the
+            page currently shown
+
+    Returns:
+        Tuple[Any, Any, Any, Any]: the table to be shown, the new page and
+        whether the previous and next buttons are disabled
+    """
+    view = {
+        **view,
+        "sort": view["sort"] or "name_asc",
+        "tags": sorted(view["tags"] or []),
+        "tag_mode": view["tag_mode"] or "all",
+        "tags_not": sorted(view["tags_not"] or []),
+    }
+    counters: Dict[str, Any] = {
+        name: count or 0 for name, count in clicks.items()
+    }
+    page = page or {}
+    query = inventory_query(view, counters, page)
+    tag_query = TagQuery(
+        tuple(view["tags"]), view["tag_mode"], tuple(view["tags_not"])
+    )
+    versions = get_tracker(db_path).versions()
+    rendered = memo_cache.get_or_create(
+        db_path,
+        (
+            "inventory",
+            tuple(versions.get(t) for t in INVENTORY_TABLES),
+            query,
+            tag_query,
+        ),
+        lambda: render_inventory_page(query, tag_query),
+    )
+    counters["view"] = view
+    if rendered is None:
+        # Past the last page, only remember the clicks.
+        return no_update, {**page, **counters}, no_update, no_update
+    table, bounds, has_prev, has_next = rendered
+    return [table], {**bounds, **counters}, not has_prev, not has_next
+
+
+def render_inventory_page(
+    query: PageQuery, tag_query: TagQuery = TagQuery()
+) -> Tuple[html.Table, Dict[str, Any], bool, bool] | None:
+    """Fetch and render one page of the ingredient inventory.
 
     Args:
-        ingredient_data (List): stored ingredient data
-        translate (List): stored ingredient_id and tag_id data
-        tags (List): stored tag data
+        query (PageQuery): sort order, name filter and position of the page
+        tag_query (TagQuery): tags the ingredients must and must not carry.
+            Defaults to no tag filter.
 
     Returns:
-        List: list containing the table to be shown
+        Tuple[html.Table, Dict[str, Any], bool, bool] | None: the table, the
+        page cursors and whether there are previous and next pages, None if
+        there are no rows beyond the cursor
     """
-    temp_df = pd.DataFrame(ingredient_data).loc[
-        :, ["id", "ingredient_name", "inventory_amount"]
+    id_filter: Dict[str, Any] = {}
+    if tag_query.active:
+        ids, matching = get_tag_index(db_path).query(tag_query).shorter()
+        id_filter = {"ingredient_ids" if matching else "excluded_ids": ids}
+    result = fetch_inventory_page(SQLHandler(db_path), query, **id_filter)
+    if result.items.empty and query.cursor is not None:
+        return None
+    bounds = {"first": result.first, "last": result.last}
+    table = display_items(result.items)
+    return table, bounds, result.has_prev, result.has_next
+
+
+@background_callback(
+    Output("import_status", "children"),
+    Input("import_upload", "contents"),
+    State("import_upload", "filename"),
+    State("import_table", "value"),
+    progress=Output("import_progress", "children"),
+    cancel=Input("import_cancel", "n_clicks"),
+    running=[
+        (Output("import_cancel", "disabled"), False, True),
+        (Output("import_upload", "disabled"), True, False),
+    ],
+    prevent_initial_call=True,
+)
+def import_upload(
+    set_progress: Callable[[str], None],
+    contents: str | None,
+    filename: str | None,
+    table_name: str,
+) -> str:
+    """Stream an uploaded CSV or Parquet file into a table.
+
+    Runs as a background job, which reports the imported rows after every
+    transaction and stops when the cancel button is clicked. Transactions
+    committed before a cancel or a failure are kept.
+
+    Args:
+        set_progress (Callable[[str], None]): shows a progress message
+        contents (str | None): uploaded file as a base64 data url
+        filename (str | None): name of the uploaded file
+        table_name (str): table to insert into
+
+    Returns:
+        str: number of imported rows or the reason the import failed
+    """
+    if not contents or not filename:
+        return ""
+    payload = base64.b64decode(contents.split(",", 1)[1])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / Path(filename).name
+        path.write_bytes(payload)
+        try:
+            rows = bulk_import.import_file(
+                db_path,
+                table_name,
+                path,
+                bulk_import.ImportOptions(progress=set_progress),
+            )
+        except bulk_import.ImportFailedError as err:
+            return f"Import of {filename} failed. {err}"
+        except (ImportError, KeyError, ValueError) as err:
+            return f"Import of {filename} failed: {err}"
+    return f"Imported {rows} rows of {filename} into {table_name}."
+
+
+@callback(
+    Output("meal_feasible", "children"),
+    Input("ingredient_data_version", "data"),
+    Input("meal_data_version", "data"),
+)
+@instrument
+def display_feasible_meals(
+    _ingredient_version: int | None, _meal_version: int | None
+) -> html.Table:
+    """List the meals that can be cooked from the current inventory.
+
+    Meals that cannot be cooked follow, ordered by the number of
+    ingredients with too little stock.
+
+    Args:
+        _ingredient_version (int | None): version of the ingredients table,
+            triggers the update
+        _meal_version (int | None): version of the meals table, triggers the
+            update
+
+    Returns:
+        html.Table: meals and their missing ingredient counts
+    """
+    meals = get_feasibility(db_path).feasible_meals(FEASIBLE_ROWS)
+    table_head = html.Thead(html.Tr([html.Th("Meal"), html.Th("Missing")]))
+    table_body = html.Tbody(
+        [
+            html.Tr(
+                [
+                    html.Td(name),
+                    html.Td("ready" if short == 0 else f"{short} items"),
+                ],
+                className="row-hover",
+            )
+            for name, short in zip(meals["name"], meals["short"])
+        ]
+    )
+    return html.Table([table_head, table_body], id="meal_feasible_list")
+
+
+@callback(
+    Output("plan_meal", "options"),
+    Input("meal_data_version", "data"),
+)
+@instrument
+def plan_meal_options(meal_version: int | None) -> List[Dict[str, Any]]:
+    """Offer every meal for the weekly plan.
+
+    Args:
+        meal_version (int | None): version token of the meals
+
+    Returns:
+        List[Dict[str, Any]]: dropdown options, the meal id as value
+    """
+    meals = get_table_cache(db_path).frame("meals", meal_version)
+    return [
+        {"label": name, "value": meal_id}
+        for meal_id, name in zip(meals["id"].tolist(), meals["name"].tolist())
     ]
-    translate_df = pd.DataFrame(translate)
-    tags_df = pd.DataFrame(tags)
-    temp_df = temp_df.merge(
-        translate_df, left_on="id", right_on="ingredient_id"
+
+
+@callback(
+    Output("plan_data", "data"),
+    Input("plan_set", "n_clicks"),
+    Input("plan_clear", "n_clicks"),
+    State("plan_meal", "value"),
+    State("plan_count", "value"),
+    State("plan_data", "data"),
+    prevent_initial_call=True,
+)
+@instrument
+def update_plan(
+    _set_clicks: int | None,
+    _clear_clicks: int | None,
+    meal_id: int | None,
+    count: int | None,
+    plan: Dict[str, Any] | None,
+) -> Dict[str, Any]:
+    """Set the servings of a meal in the weekly plan or clear the plan.
+
+    Args:
+        _set_clicks (int | None): clicks of the set button
+        _clear_clicks (int | None): clicks of the clear button
+        meal_id (int | None): selected meal
+        count (int | None): servings, 0 removes the meal from the plan
+        plan (Dict[str, Any] | None): plan id and servings per meal id
+
+    Returns:
+        Dict[str, Any]: the updated plan
+    """
+    # The id keys the memoized requirements of the plan on the server.
+    plan = plan or {"id": uuid.uuid4().hex, "meals": {}}
+    if ctx.triggered_id == "plan_clear":
+        return {**plan, "meals": {}}
+    if meal_id is None:
+        return plan
+    meals = {
+        key: value
+        for key, value in plan["meals"].items()
+        if key != str(meal_id)
+    }
+    if count:
+        meals[str(meal_id)] = int(count)
+    return {**plan, "meals": meals}
+
+
+@callback(
+    Output("plan_meals", "children"),
+    Output("plan_shopping", "children"),
+    Input("plan_data", "data"),
+    Input("ingredient_data_version", "data"),
+    Input("meal_data_version", "data"),
+)
+@instrument
+def display_plan(
+    plan: Dict[str, Any] | None,
+    _ingredient_version: int | None,
+    meal_version: int | None,
+) -> Tuple[html.Table | None, html.Table | str | None]:
+    """Show the planned meals and the shopping list grouped by tag.
+
+    Args:
+        plan (Dict[str, Any] | None): plan id and servings per meal id
+        _ingredient_version (int | None): version of the ingredients table,
+            triggers the update
+        meal_version (int | None): version token of the meals
+
+    Returns:
+        Tuple[html.Table | None, html.Table | str | None]: the planned meals
+        and the shopping list
+    """
+    if not plan or not plan["meals"]:
+        return None, None
+    quantities = {int(key): value for key, value in plan["meals"].items()}
+    meals = get_table_cache(db_path).frame("meals", meal_version)
+    names = dict(zip(meals["id"].tolist(), meals["name"].tolist()))
+    plan_table = html.Table(
+        [
+            html.Thead(html.Tr([html.Th("Meal"), html.Th("Servings")])),
+            html.Tbody(
+                [
+                    html.Tr([html.Td(names.get(meal_id)), html.Td(count)])
+                    for meal_id, count in quantities.items()
+                ]
+            ),
+        ],
+        id="plan_meal_list",
     )
-    temp_df = temp_df.merge(
-        tags_df.rename(columns={"id": "tag_id"}), on="tag_id"
+    to_buy = shopping_list(db_path, plan["id"], quantities)
+    if to_buy.empty:
+        return plan_table, "Everything is in stock."
+    rows = []
+    for tag_name, group in to_buy.groupby("tag_name", sort=False):
+        rows.append(html.Tr(html.Th(str(tag_name), colSpan=2)))
+        rows.extend(
+            html.Tr([html.Td(name), html.Td(round(amount, 2))])
+            for name, amount in zip(group["ingredient_name"], group["amount"])
+        )
+    shopping_table = html.Table(
+        [
+            html.Thead(html.Tr([html.Th("Item"), html.Th("To buy")])),
+            html.Tbody(rows),
+        ],
+        id="plan_shopping_list",
     )
-    table = display_items(temp_df)
-    return [table]
+    return plan_table, shopping_table
+
+
+@callback(
+    Output("inv_tags", "options"),
+    Output("inv_tags_not", "options"),
+    Input("tag_data_version", "data"),
+)
+@instrument
+def inventory_tag_options(
+    tag_version: int | None,
+) -> Tuple[List[str], List[str]]:
+    """Offer every tag name for the inventory tag filter.
+
+    Args:
+        tag_version (int | None): version token of the tags
+
+    Returns:
+        Tuple[List[str], List[str]]: options of the with and without tags
+        dropdowns
+    """
+    tags = get_table_cache(db_path).frame("tags", tag_version)
+    names = sorted(tags["tag_name"].dropna().unique())
+    return names, names
+
+
+def suggestion_options(text: str | None, kind: Kind) -> List[html.Option]:
+    """Look up the names matching a partial input as datalist options.
+
+    Args:
+        text (str | None): text typed so far
+        kind (Kind): kind of names to suggest
+
+    Returns:
+        List[html.Option]: best matches first
+    """
+    suggestions = get_search_index(db_path).suggest(text, kind)
+    return [html.Option(value=suggestion.name) for suggestion in suggestions]
+
+
+@callback(
+    Output("inv_name_options", "children"),
+    Input("inv_name", "value"),
+)
+@instrument
+def suggest_ingredient_names(text: str | None) -> List[html.Option]:
+    """Suggest ingredient names while typing a new inventory item.
+
+    Args:
+        text (str | None): text typed so far
+
+    Returns:
+        List[html.Option]: suggestions
+    """
+    return suggestion_options(text, "ingredient")
+
+
+@callback(
+    Output("meal_inp_options", "children"),
+    Input("meal_inp", "value"),
+)
+@instrument
+def suggest_meal_names(text: str | None) -> List[html.Option]:
+    """Suggest meal names while typing a meal.
+
+    Args:
+        text (str | None): text typed so far
+
+    Returns:
+        List[html.Option]: suggestions
+    """
+    return suggestion_options(text, "meal")
+
+
+@callback(
+    Output("comp_inp_options", "children"),
+    Input("comp_inp", "value"),
+)
+@instrument
+def suggest_component_names(text: str | None) -> List[html.Option]:
+    """Suggest ingredient names while typing a recipe component.
+
+    Args:
+        text (str | None): text typed so far
+
+    Returns:
+        List[html.Option]: suggestions
+    """
+    return suggestion_options(text, "ingredient")
@@ -0,0 +1,126 @@
+"""
+This module contains the background callback manager of the app.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, List
+
+from dash import callback
+
+CACHE_DIR = Path(
+    os.environ.get(
+        "FOOD_CACHE_DIR", Path(tempfile.gettempdir()) / "food_dash_app"
+    )
+)
+# Seconds a cached background result is kept.
+CACHE_EXPIRE = 600
+# Milliseconds between two polls of the browser for the result of a job.
+POLL_INTERVAL = 250
+
+# Called on every background request, their values become part of the
+# result cache key, e.g. the table versions the result is derived from.
+cache_key_sources: List[Callable[[], Any]] = []
+
+
+def _cache_key() -> List[Any]:
+    """Collect the values of all registered cache key sources.
+
+    Returns:
+        List[Any]: one value per source
+    """
+    return [source() for source in cache_key_sources]
+
+
+def create_manager(cache_dir: Path = CACHE_DIR) -> Any | None:
+    """Create a background callback manager backed by a disk cache.
+
+    Jobs run in their own process and results are cached by the hash of
+    the callback inputs and the cache key sources, no broker is needed.
+
+    Args:
+        cache_dir (Path): directory of the disk cache
+
+    Returns:
+        Any | None: DiskcacheManager, None if diskcache, multiprocess and
+        psutil are not installed
+    """
+    # pylint: disable=import-outside-toplevel
+    try:
+        import diskcache
+        from dash import DiskcacheManager
+    except ImportError:
+        return None
+    cache = diskcache.Cache(str(cache_dir))
+    try:
+        return DiskcacheManager(
+            cache, cache_by=[_cache_key], expire=CACHE_EXPIRE
+        )
+    except ImportError:
+        # multiprocess or psutil is missing.
+        return None
+
+
+manager = create_manager()
+
+
+def _no_progress(*_: Any) -> None:
+    """Ignore progress updates of callbacks run in the request thread."""
+
+
+def background_callback(
+    *args: Any,
+    progress: Any = None,
+    cancel: Any = None,
+    running: Any = None,
+    interval: int = POLL_INTERVAL,
+    **kwargs: Any,
+) -> Callable[[Callable[..., Any]], Any]:
+    """Register a callback that runs in a background process.
+
+    Every job forks a new process and the browser polls for its result, so
+    this is meant for long bulk jobs only. Interactive callbacks that answer
+    within a request should use dash.callback.
+
+    The function receives a set_progress function as first argument. If no
+    background manager is available, the callback runs in the request
+    thread, progress updates are ignored and it cannot be cancelled.
+
+    Args:
+        args (Any): outputs, inputs and states as for dash.callback
+        progress (Any): outputs updated by set_progress
+        cancel (Any): inputs that cancel a running job
+        running (Any): (output, value while running, value after) tuples
+        interval (int): milliseconds between the polls of the browser.
+            Defaults to POLL_INTERVAL.
+        kwargs (Any): further keyword arguments of dash.callback
+
+    Returns:
+        Callable[[Callable[..., Any]], Any]: callback decorator
+    """
+
+    def decorator(func: Callable[..., Any]) -> Any:
+        if manager is not None:
+            return callback(
+                *args,
+                background=True,
+                manager=manager,
+                progress=progress,
+                cancel=cancel,
+                running=running,
+                interval=interval,
+                **kwargs,
+            )(func)
+
+        def foreground(*cb_args: Any) -> Any:
+            return func(_no_progress, *cb_args)
+
+        foreground.__name__ = func.__name__
+        foreground.__doc__ = func.__doc__
+        return callback(*args, **kwargs)(foreground)
+
+    return decorator
@@ -0,0 +1,44 @@
+"""
+This module contains the configuration of the app and its server.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_DB_PATH = Path.cwd() / "sql" / "example.db"
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    """Settings of the app, read from FOOD_* environment variables."""
+
+    db_path: Path = DEFAULT_DB_PATH
+    host: str = "127.0.0.1"
+    port: int = 8050
+    debug: bool = True
+    workers: int = 2
+    threads: int = 4
+
+    @classmethod
+    def from_env(cls) -> "AppConfig":
+        """Read the configuration from the environment.
+
+        FOOD_DB_PATH, FOOD_HOST, FOOD_PORT, FOOD_DEBUG, FOOD_WORKERS and
+        FOOD_THREADS override the defaults.
+
+        Returns:
+            AppConfig: configuration
+        """
+        env = os.environ
+        return cls(
+            db_path=Path(env.get("FOOD_DB_PATH", DEFAULT_DB_PATH)),
+            host=env.get("FOOD_HOST", cls.host),
+            port=int(env.get("FOOD_PORT", cls.port)),
+            debug=env.get("FOOD_DEBUG", "1").lower() in ("1", "true", "yes"),
+            workers=int(env.get("FOOD_WORKERS", cls.workers)),
+            threads=int(env.get("FOOD_THREADS", cls.threads)),
+        )
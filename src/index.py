@@ -9,17 +9,13 @@ import dash
 import dash_bootstrap_components as dbc
 from dash import dcc, html
 
-import src.app_callbacks  # noqa # pylint: disable=unused-import
+import src.app_callbacks
+from src.config import AppConfig
+from src.instrumentation import register_metrics_route
 
 SECOND = 1000
 MINUTE = 60 * SECOND
 MINUTES10 = 10 * MINUTE
-# Define the Dash app
-app = dash.Dash(
-    __name__,
-    use_pages=True,
-    external_stylesheets=[dbc.themes.SLATE, "assets/style.css"],
-)
 nav_link_style = {
     "margin": "1em 1em",
     "text-align": "center",
@@ -65,17 +61,39 @@ navbar = dbc.Navbar(
     },
 )
 
-# Set the app layout
-app.layout = dbc.Container(
-    children=[
-        navbar,
-        dbc.Row(html.Div(dash.page_container)),
-        dcc.Store(id="meal_data", storage_type="session"),
-        dcc.Store(id="ingredient_data", storage_type="session"),
-        dcc.Store(id="tag_data", storage_type="session"),
-        dcc.Store(id="tag_ingredient_data", storage_type="session"),
-        dcc.Interval(id="10_min", interval=MINUTES10),
-    ],
-    className="dbc",
-    fluid=True,
-)
+
+def create_app(config: AppConfig | None = None) -> dash.Dash:
+    """Build the Dash app and point its callbacks at the configured db.
+
+    The callbacks are registered with dash.callback and move to the first
+    app that serves a request, so build only one app per process.
+
+    Args:
+        config (AppConfig | None): configuration, read from the environment
+            if None.
+
+    Returns:
+        dash.Dash: the app, its Flask server is app.server
+    """
+    config = config or AppConfig.from_env()
+    src.app_callbacks.configure(config.db_path)
+    app = dash.Dash(
+        __name__,
+        use_pages=True,
+        external_stylesheets=[dbc.themes.SLATE, "assets/style.css"],
+    )
+    register_metrics_route(app.server)
+    app.layout = dbc.Container(
+        children=[
+            navbar,
+            dbc.Row(html.Div(dash.page_container)),
+            dcc.Store(id="meal_data_version", storage_type="session"),
+            dcc.Store(id="ingredient_data_version", storage_type="session"),
+            dcc.Store(id="tag_data_version", storage_type="session"),
+            dcc.Store(id="tag_ingredient_data_version", storage_type="session"),
+            dcc.Interval(id="10_min", interval=MINUTES10),
+        ],
+        className="dbc",
+        fluid=True,
+    )
+    return app
@@ -0,0 +1,83 @@
+"""
+This module contains the callback instrumentation and the /metrics route.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import functools
+import itertools
+import json
+import time
+from typing import Any, Callable, TypeVar
+
+import flask
+import plotly
+
+from sql.metrics import SAMPLE_EVERY, SIZE_BUCKETS, TIME_BUCKETS, metrics
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+callback_seconds = metrics.histogram(
+    "dash_callback_duration_seconds",
+    "Duration of Dash callbacks.",
+    TIME_BUCKETS,
+    ("callback",),
+)
+callback_bytes = metrics.histogram(
+    "dash_callback_response_bytes",
+    "Json size of the outputs returned by Dash callbacks.",
+    SIZE_BUCKETS,
+    ("callback",),
+)
+
+
+def instrument(func: F) -> F:
+    """Record the duration and the output size of a callback.
+
+    Place it below the @callback decorator. Output sizes are measured on
+    every call in "full" mode and on every SAMPLE_EVERY-th call in "low"
+    mode, since serializing the outputs costs about as much as Dash's own
+    serialization.
+
+    Args:
+        func (F): callback function
+
+    Returns:
+        F: wrapped callback
+    """
+    name = func.__name__
+    calls = itertools.count()
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if metrics.mode == "off":
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        callback_seconds.observe(time.perf_counter() - start, name)
+        if metrics.mode == "full" or next(calls) % SAMPLE_EVERY == 0:
+            payload = json.dumps(result, cls=plotly.utils.PlotlyJSONEncoder)
+            callback_bytes.observe(len(payload), name)
+        return result
+
+    return wrapper  # type: ignore
+
+
+def register_metrics_route(server: flask.Flask) -> None:
+    """Expose all histograms in the Prometheus text format at /metrics.
+
+    The histograms live in the memory of each process. Behind the
+    production server every request reaches one worker, so a scrape only
+    reports the requests served by that worker.
+
+    Args:
+        server (flask.Flask): Flask server of the Dash app
+    """
+
+    def render_metrics() -> flask.Response:
+        return flask.Response(
+            metrics.render(), mimetype="text/plain; version=0.0.4"
+        )
+
+    server.add_url_rule("/metrics", "metrics", render_metrics)
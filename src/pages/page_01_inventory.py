@@ -38,6 +38,8 @@ name_inp = dcc.Input(
     type="text",
     className="row-input",
     placeholder="Enter a name",
+    list="inv_name_options",
+    debounce=0.25,
 )
 submit = dcc.ConfirmDialogProvider(
     children=html.Button("Submit", className="row-item submit-btn"),
@@ -80,7 +82,9 @@ inv_input_form = dbc.Form(
         ),
         dbc.Row(
             [
-                dbc.Col(name_inp, width=2),
+                dbc.Col(
+                    [name_inp, html.Datalist(id="inv_name_options")], width=2
+                ),
                 dbc.Col(inv_tag_dd, width=2),
                 dbc.Col(inv_tag_input, width=2),
                 dbc.Col(
@@ -113,12 +117,113 @@ data = pd.DataFrame(
 )
 
 
+inv_filter_inp = dcc.Input(
+    id="inv_filter",
+    type="text",
+    debounce=True,
+    className="row-input",
+    placeholder="Filter by name",
+)
+
+inv_sort_dd = dcc.Dropdown(
+    id="inv_sort",
+    options=[
+        {"label": "Name (A-Z)", "value": "name_asc"},
+        {"label": "Name (Z-A)", "value": "name_desc"},
+        {"label": "Amount (low-high)", "value": "amount_asc"},
+        {"label": "Amount (high-low)", "value": "amount_desc"},
+    ],
+    value="name_asc",
+    clearable=False,
+)
+
+inv_prev_btn = html.Button(
+    "Previous", id="inv_prev", className="row-item submit-btn", disabled=True
+)
+inv_next_btn = html.Button(
+    "Next", id="inv_next", className="row-item submit-btn", disabled=True
+)
+
+inv_list_controls = dbc.Row(
+    [
+        dbc.Col(inv_filter_inp, width=2),
+        dbc.Col(inv_sort_dd, width=2),
+        dbc.Col(inv_prev_btn, width={"size": 1, "offset": 5}),
+        dbc.Col(inv_next_btn, width=1),
+    ]
+)
+
+inv_tags_dd = dcc.Dropdown(
+    id="inv_tags", multi=True, placeholder="With tags..."
+)
+inv_tag_mode_dd = dcc.Dropdown(
+    id="inv_tag_mode",
+    options=[
+        {"label": "All tags", "value": "all"},
+        {"label": "Any tag", "value": "any"},
+    ],
+    value="all",
+    clearable=False,
+)
+inv_tags_not_dd = dcc.Dropdown(
+    id="inv_tags_not", multi=True, placeholder="Without tags..."
+)
+
+inv_tag_controls = dbc.Row(
+    [
+        dbc.Col(inv_tags_dd, width=4),
+        dbc.Col(inv_tag_mode_dd, width=2),
+        dbc.Col(inv_tags_not_dd, width=4),
+    ]
+)
+
 item_overview = html.Div(
     children=[
         html.H4("Item Overview:"),
+        inv_list_controls,
+        inv_tag_controls,
         dbc.Row(dbc.Col(id="inv_list")),
+        dcc.Store(id="inv_page"),
     ],
     id="inv_item_overview",
 )
 
-layout = dbc.Container([headline, inv_input_form, item_overview], fluid=True)
+import_table_dd = dcc.Dropdown(
+    id="import_table",
+    options=[
+        {"label": "Ingredients", "value": "ingredients"},
+        {"label": "Tags", "value": "tags"},
+        {"label": "Ingredient tags", "value": "ingredient_tags"},
+        {"label": "Meals", "value": "meals"},
+    ],
+    value="ingredients",
+    clearable=False,
+)
+import_upload = dcc.Upload(
+    html.Button("Import file", className="row-item submit-btn"),
+    id="import_upload",
+    accept=".csv,.txt,.parquet,.pq",
+)
+import_cancel_btn = html.Button(
+    "Cancel", id="import_cancel", className="row-item submit-btn", disabled=True
+)
+
+bulk_import = html.Div(
+    children=[
+        html.H4("Bulk import:"),
+        dbc.Row(
+            [
+                dbc.Col(import_table_dd, width=2),
+                dbc.Col(import_upload, width=2),
+                dbc.Col(import_cancel_btn, width=1),
+                dbc.Col(html.Div(id="import_progress"), width=3),
+                dbc.Col(html.Div(id="import_status"), width=4),
+            ]
+        ),
+    ],
+    id="inv_bulk_import",
+)
+
+layout = dbc.Container(
+    [headline, inv_input_form, item_overview, bulk_import], fluid=True
+)
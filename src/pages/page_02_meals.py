@@ -35,12 +35,16 @@ meal_name_inp = dcc.Input(
     placeholder="Enter a meal name...",
     className="grid grid-input",
     id="meal_inp",
+    list="meal_inp_options",
+    debounce=0.25,
 )
 comp_name_inp = dcc.Input(
     type="text",
     placeholder="Enter an ingredient name...",
     className="grid grid-input",
     id="comp_inp",
+    list="comp_inp_options",
+    debounce=0.25,
 )
 amount_inp = dcc.Input(
     type="number", placeholder=0, className="grid grid-input", id="amount_inp"
@@ -66,8 +70,16 @@ add_meal_dbc = dbc.Form(
         ),
         dbc.Row(
             [
-                dbc.Col(meal_name_inp, width=4, class_name="grid"),
-                dbc.Col(comp_name_inp, width=4, class_name="grid"),
+                dbc.Col(
+                    [meal_name_inp, html.Datalist(id="meal_inp_options")],
+                    width=4,
+                    class_name="grid",
+                ),
+                dbc.Col(
+                    [comp_name_inp, html.Datalist(id="comp_inp_options")],
+                    width=4,
+                    class_name="grid",
+                ),
                 dbc.Col(amount_inp, width=4, class_name="grid"),
             ]
         ),
@@ -88,4 +100,48 @@ add_meal_dbc = dbc.Form(
     ],
     id="add_meal_div",
 )
-layout = dbc.Container([headline, add_meal_dbc], fluid=True)
+feasible_div = html.Div(
+    [html.H2("What can I cook now"), html.Div(id="meal_feasible")],
+    id="meal_feasible_div",
+)
+
+plan_meal_dd = dcc.Dropdown(id="plan_meal", placeholder="Select a meal...")
+plan_count_inp = dcc.Input(
+    id="plan_count",
+    type="number",
+    min=0,
+    step=1,
+    value=1,
+    className="row-input",
+)
+plan_set_btn = html.Button(
+    "Set servings", id="plan_set", className="row-item submit-btn"
+)
+plan_clear_btn = html.Button(
+    "Clear plan", id="plan_clear", className="row-item submit-btn"
+)
+
+plan_div = html.Div(
+    [
+        html.H2("Weekly plan"),
+        dbc.Row(
+            [
+                dbc.Col(plan_meal_dd, width=4),
+                dbc.Col(plan_count_inp, width=2),
+                dbc.Col(plan_set_btn, width=2),
+                dbc.Col(plan_clear_btn, width={"size": 2, "offset": 2}),
+            ]
+        ),
+        dbc.Row(
+            [
+                dbc.Col(html.Div(id="plan_meals"), width=4),
+                dbc.Col(html.Div(id="plan_shopping"), width=8),
+            ]
+        ),
+        dcc.Store(id="plan_data", storage_type="session"),
+    ],
+    id="plan_div",
+)
+layout = dbc.Container(
+    [headline, add_meal_dbc, feasible_div, plan_div], fluid=True
+)
@@ -5,7 +5,67 @@ Author: Jonas Schrage
 Date: 17.04.2023
 
 """
+import argparse
+import sys
+from pathlib import Path
+
+import src.scripts.bulk_import as bi
 import src.scripts.load_sample_data as lsd
 
+
+def main() -> None:
+    """Load the sample data or bulk import a file."""
+    parser = argparse.ArgumentParser(prog="python -m src.scripts")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("sample", help="create example.db with sample data")
+    import_parser = subparsers.add_parser(
+        "import", help="stream a CSV or Parquet file into a table"
+    )
+    import_parser.add_argument("table", help="table to insert into")
+    import_parser.add_argument("file", type=Path, help="CSV or Parquet file")
+    import_parser.add_argument(
+        "--db",
+        type=Path,
+        default=Path.cwd() / "sql" / "example.db",
+        help="path to the sqlite db, defaults to sql/example.db",
+    )
+    import_parser.add_argument(
+        "--chunk-size", type=int, default=bi.CHUNK_SIZE, help="rows per chunk"
+    )
+    import_parser.add_argument(
+        "--chunks-per-transaction",
+        type=int,
+        default=bi.CHUNKS_PER_TRANSACTION,
+        help="chunks committed in one transaction",
+    )
+    import_parser.add_argument(
+        "--skip-rows",
+        type=int,
+        default=0,
+        help="leading data rows to skip, to resume a failed import",
+    )
+    args = parser.parse_args()
+
+    if args.command == "import":
+        try:
+            bi.import_file(
+                args.db,
+                args.table,
+                args.file,
+                bi.ImportOptions(
+                    chunk_size=args.chunk_size,
+                    chunks_per_transaction=args.chunks_per_transaction,
+                    skip_rows=args.skip_rows,
+                ),
+            )
+        except bi.ImportFailedError as err:
+            sys.exit(
+                f"Import into {args.table} failed. {err} "
+                f"Resume with --skip-rows {err.committed}."
+            )
+    else:
+        lsd.main()
+
+
 if __name__ == "__main__":
-    lsd.main()
+    main()
@@ -0,0 +1,162 @@
+"""
+This script measures read throughput while a writer is active.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import argparse
+import functools
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import sqlalchemy as sa
+
+from sql.engine_registry import (
+    DEFAULT_PROFILE,
+    STOCK_PROFILE,
+    EngineRegistry,
+    SQLiteProfile,
+    registry,
+)
+from src.scripts.load_sample_data import create_database
+
+READ_STMT = sa.text(
+    "SELECT id, ingredient_name, inventory_amount FROM ingredients "
+    "WHERE id BETWEEN :low AND :low + 100"
+)
+WRITE_STMT = sa.text(
+    "UPDATE ingredients SET inventory_amount = inventory_amount + 1 "
+    "WHERE id = :id"
+)
+
+
+def seed_database(db_location: Path, rows: int) -> None:
+    """Create a throwaway database holding the given number of ingredients.
+
+    Args:
+        db_location (Path): The file location for the SQLite database.
+        rows (int): number of ingredients
+    """
+    create_database(db_location)
+    # Close the shared engine, so the benchmark profile can set the journal.
+    registry.dispose(db_location)
+    engine = sa.create_engine(f"sqlite:///{db_location}")
+    with engine.begin() as conn:
+        conn.execute(
+            sa.text(
+                "INSERT INTO ingredients (ingredient_name, inventory_amount) "
+                "VALUES (:name, :amount)"
+            ),
+            [{"name": f"item {i}", "amount": i % 10} for i in range(rows)],
+        )
+    engine.dispose()
+
+
+def run_threads(
+    targets: List[Callable[[], None]], stop: threading.Event, duration: float
+) -> None:
+    """Run functions in parallel threads for a fixed time.
+
+    Args:
+        targets (List[Callable[[], None]]): thread functions, they must
+            return once stop is set
+        stop (threading.Event): set after duration seconds
+        duration (float): seconds to run
+    """
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+
+def run_benchmark(
+    profile: SQLiteProfile,
+    rows: int = 20_000,
+    readers: int = 4,
+    duration: float = 3.0,
+) -> Dict[str, float]:
+    """Run readers against a fresh database while one thread keeps writing.
+
+    Args:
+        profile (SQLiteProfile): pragmas set on every connection
+        rows (int): ingredients in the database. Defaults to 20_000.
+        readers (int): concurrent reader threads. Defaults to 4.
+        duration (float): seconds to run. Defaults to 3.0.
+
+    Returns:
+        Dict[str, float]: reads and writes per second, failed operations
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_location = Path(tmp_dir) / "bench.db"
+        seed_database(db_location, rows)
+        bench_registry = EngineRegistry(pool_size=readers + 1, profile=profile)
+        engine = bench_registry.get_engine(db_location)
+        stop = threading.Event()
+        reads: List[int] = [0] * readers
+        writes: List[int] = [0]
+        errors: List[int] = [0]
+
+        def read(slot: int) -> None:
+            while not stop.is_set():
+                try:
+                    with engine.connect() as conn:
+                        low = random.randint(1, rows)
+                        conn.execute(READ_STMT, {"low": low}).fetchall()
+                    reads[slot] += 1
+                except sa.exc.OperationalError:
+                    errors[0] += 1
+
+        def write() -> None:
+            while not stop.is_set():
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(
+                            WRITE_STMT, {"id": random.randint(1, rows)}
+                        )
+                    writes[0] += 1
+                except sa.exc.OperationalError:
+                    errors[0] += 1
+
+        run_threads(
+            [write]
+            + [functools.partial(read, slot) for slot in range(readers)],
+            stop,
+            duration,
+        )
+        bench_registry.dispose()
+    return {
+        "reads_per_s": sum(reads) / duration,
+        "writes_per_s": writes[0] / duration,
+        "errors": errors[0],
+    }
+
+
+def main() -> None:
+    """Compare stock sqlite settings with the default performance profile."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.scripts.bench_sqlite_profile"
+    )
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+
+    for name, profile in (("stock", STOCK_PROFILE), ("tuned", DEFAULT_PROFILE)):
+        result = run_benchmark(profile, args.rows, args.readers, args.duration)
+        print(
+            f"{name:>6}: {result['reads_per_s']:9.0f} reads/s "
+            f"{result['writes_per_s']:8.0f} writes/s "
+            f"{result['errors']:5.0f} errors"
+        )
+
+
+if __name__ == "__main__":
+    main()
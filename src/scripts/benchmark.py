@@ -0,0 +1,313 @@
+"""
+This script times the app's data paths on synthetic datasets.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import dash
+import pandas as pd
+
+import src.app_callbacks as callbacks
+from sql.engine_registry import registry
+from sql.inventory import read_inventory
+from sql.memo_cache import memo_cache
+from sql.sql_handler import SQLHandler
+from src.config import AppConfig
+from src.index import create_app
+from src.scripts.synthetic_data import DatasetSpec, create_synthetic_database
+
+SIZES = (1_000, 10_000, 50_000)
+REPEAT = 5
+WRITE_ROWS = 1_000
+INVENTORY_OUTPUTS = [
+    {"id": "inv_list", "property": "children"},
+    {"id": "inv_page", "property": "data"},
+    {"id": "inv_prev", "property": "disabled"},
+    {"id": "inv_next", "property": "disabled"},
+]
+TAG_OUTPUTS = [
+    {"id": "multi-dropdown", "property": "value"},
+    {"id": "multi-dropdown", "property": "options"},
+    {"id": "custom-tag-input", "property": "value"},
+]
+
+
+def timed(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Call a function repeatedly and summarize the wall times.
+
+    Args:
+        func (Callable[[], Any]): function to time
+        repeat (int): number of calls
+
+    Returns:
+        Dict[str, float]: min, median and mean seconds and the call count
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times),
+        "runs": repeat,
+    }
+
+
+def callback_request(
+    outputs: List[Dict[str, str]],
+    inputs: List[Dict[str, Any]],
+    state: List[Dict[str, Any]],
+    changed: str,
+) -> Dict[str, Any]:
+    """Build the body of a Dash callback request as the browser sends it.
+
+    Args:
+        outputs (List[Dict[str, str]]): output ids and properties
+        inputs (List[Dict[str, Any]]): input ids, properties and values
+        state (List[Dict[str, Any]]): state ids, properties and values
+        changed (str): "id.property" of the input that triggered
+
+    Returns:
+        Dict[str, Any]: json body for /_dash-update-component
+    """
+    output = "...".join(f"{o['id']}.{o['property']}" for o in outputs)
+    return {
+        "output": f"..{output}..",
+        "outputs": outputs,
+        "inputs": inputs,
+        "state": state,
+        "changedPropIds": [changed],
+    }
+
+
+def inventory_request(sort: str) -> Dict[str, Any]:
+    """Build the request of the inventory table callback.
+
+    Args:
+        sort (str): value of the sort dropdown
+
+    Returns:
+        Dict[str, Any]: json body of the first page in the given order
+    """
+    inputs: List[Dict[str, Any]] = [
+        {"id": "ingredient_data_version", "property": "data", "value": None},
+        {
+            "id": "tag_ingredient_data_version",
+            "property": "data",
+            "value": None,
+        },
+        {"id": "tag_data_version", "property": "data", "value": None},
+        {"id": "inv_sort", "property": "value", "value": sort},
+        {"id": "inv_filter", "property": "value", "value": None},
+        {"id": "inv_tags", "property": "value", "value": None},
+        {"id": "inv_tag_mode", "property": "value", "value": "all"},
+        {"id": "inv_tags_not", "property": "value", "value": None},
+        {"id": "inv_prev", "property": "n_clicks", "value": None},
+        {"id": "inv_next", "property": "n_clicks", "value": None},
+    ]
+    return callback_request(
+        INVENTORY_OUTPUTS,
+        inputs,
+        [{"id": "inv_page", "property": "data", "value": None}],
+        "inv_sort.value",
+    )
+
+
+def post_callback(client: Any, body: Dict[str, Any]) -> None:
+    """Send a callback request through the Flask test client.
+
+    Args:
+        client (Any): Flask test client of the app server
+        body (Dict[str, Any]): callback request body
+
+    Raises:
+        RuntimeError: The callback failed.
+    """
+    response = client.post("/_dash-update-component", json=body)
+    if response.status_code not in (200, 204):
+        raise RuntimeError(
+            f"Callback failed with {response.status_code}: "
+            f"{response.get_data(as_text=True)[:200]}"
+        )
+
+
+def run_size(
+    app: dash.Dash, db_location: Path, repeat: int
+) -> Dict[str, Dict[str, float]]:
+    """Time all benchmarks on one database.
+
+    Args:
+        app (dash.Dash): app serving the callbacks
+        db_location (Path): synthetic database
+        repeat (int): calls per benchmark
+
+    Returns:
+        Dict[str, Dict[str, float]]: timings by benchmark name
+    """
+    callbacks.configure(db_location)
+    client = app.server.test_client()
+    inventory = read_inventory(SQLHandler(db_location))
+    inventory_body = inventory_request("name_asc")
+    new_tags = iter(range(1_000_000))
+
+    def add_tag() -> None:
+        body = callback_request(
+            TAG_OUTPUTS,
+            [
+                {"id": "add-tag-button", "property": "n_clicks", "value": 1},
+                {"id": "tag_data_version", "property": "data", "value": None},
+            ],
+            [
+                {"id": "multi-dropdown", "property": "value", "value": []},
+                {"id": "multi-dropdown", "property": "options", "value": []},
+                {
+                    "id": "custom-tag-input",
+                    "property": "value",
+                    "value": f"bench tag {next(new_tags)}",
+                },
+            ],
+            "add-tag-button.n_clicks",
+        )
+        post_callback(client, body)
+
+    def cold_inventory() -> None:
+        memo_cache.invalidate(db_location)
+        post_callback(client, inventory_body)
+
+    write_rows = pd.DataFrame(
+        {
+            "ingredient_name": [f"written {i}" for i in range(WRITE_ROWS)],
+            "inventory_amount": 1.0,
+        }
+    )
+    written = iter(range(1_000_000))
+
+    def write_table() -> None:
+        batch = write_rows.assign(
+            ingredient_name=write_rows["ingredient_name"] + f" {next(written)}"
+        )
+        SQLHandler(db_location, "ingredients").write_table(
+            batch, if_exists="append"
+        )
+
+    return {
+        "read_data": timed(lambda: callbacks.read_data("ingredients"), repeat),
+        "display_items": timed(
+            lambda: callbacks.display_items(inventory), repeat
+        ),
+        "display_ingredient_inventory": timed(cold_inventory, repeat),
+        "display_ingredient_inventory_cached": timed(
+            lambda: post_callback(client, inventory_body), repeat
+        ),
+        "add_new_tag": timed(add_tag, repeat),
+        "write_table": timed(write_table, repeat),
+    }
+
+
+def git_commit() -> str | None:
+    """Get the commit the benchmark runs on.
+
+    Returns:
+        str | None: commit hash, None outside a git checkout
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    sizes: List[int],
+    tags: int,
+    fan_out: int,
+    meal_ratio: float,
+    repeat: int,
+) -> Dict[str, Any]:
+    """Run the benchmarks on a fresh synthetic database per size.
+
+    Args:
+        sizes (List[int]): numbers of ingredients
+        tags (int): number of tags
+        fan_out (int): tags per ingredient
+        meal_ratio (float): meals per ingredient
+        repeat (int): calls per benchmark
+
+    Returns:
+        Dict[str, Any]: json friendly results with environment information
+    """
+    app = create_app(AppConfig(debug=False))
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_location = Path(tmp_dir) / "bench.db"
+            meals = max(1, int(size * meal_ratio))
+            rows = create_synthetic_database(
+                db_location, DatasetSpec(size, meals, tags, fan_out)
+            )
+            timings = run_size(app, db_location, repeat)
+            registry.dispose(db_location)
+        results.append({"rows": rows, "timings": timings})
+        print(
+            f"{size:>8} ingredients: "
+            + ", ".join(
+                f"{name} {t['median_s'] * 1e3:.1f} ms"
+                for name, t in timings.items()
+            )
+        )
+    return {
+        "commit": git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "tags": tags,
+            "fan_out": fan_out,
+            "meal_ratio": meal_ratio,
+            "repeat": repeat,
+            "write_rows": WRITE_ROWS,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    """Run the benchmark suite and save the results as json."""
+    parser = argparse.ArgumentParser(prog="python -m src.scripts.benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--tags", type=int, default=50)
+    parser.add_argument("--fan-out", type=int, default=3)
+    parser.add_argument("--meal-ratio", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument(
+        "--output", type=Path, default=Path("benchmark_results.json")
+    )
+    args = parser.parse_args()
+
+    report = run(
+        args.sizes, args.tags, args.fan_out, args.meal_ratio, args.repeat
+    )
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
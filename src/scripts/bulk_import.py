@@ -0,0 +1,243 @@
+"""
+This script streams large CSV or Parquet files into the sqlite db.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import itertools
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, cast
+
+import pandas as pd
+import sqlalchemy as sa
+
+from sql.sql_handler import SQLHandler
+from src.scripts.load_sample_data import ingredient_name_to_id, tag_name_to_id
+
+CHUNK_SIZE = 50_000
+CHUNKS_PER_TRANSACTION = 4
+# Errors of a chunk that are reported with the rows committed before it.
+WRITE_ERRORS = (KeyError, ValueError, sa.exc.SQLAlchemyError)
+
+
+def iter_chunks(
+    path: str | Path, chunk_size: int, skip_rows: int = 0
+) -> Iterator[pd.DataFrame]:
+    """Read a CSV or Parquet file in chunks of a fixed number of rows.
+
+    Args:
+        path (str | Path): CSV or Parquet file
+        chunk_size (int): rows per chunk
+        skip_rows (int): leading data rows to leave out. Defaults to 0.
+
+    Raises:
+        ImportError: pyarrow is needed for Parquet files.
+        ValueError: Unsupported file type.
+
+    Yields:
+        Iterator[pd.DataFrame]: chunks of the file
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in (".csv", ".txt"):
+        yield from pd.read_csv(
+            path, chunksize=chunk_size, skiprows=range(1, skip_rows + 1)
+        )
+    elif suffix in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+        except ImportError as err:
+            raise ImportError(
+                "Reading Parquet files requires pyarrow to be installed."
+            ) from err
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            if skip_rows >= batch.num_rows:
+                skip_rows -= batch.num_rows
+                continue
+            yield batch.slice(skip_rows).to_pandas()
+            skip_rows = 0
+    else:
+        raise ValueError(f"Unsupported file type {suffix}.")
+
+
+def write_chunk(
+    tables: Dict[str, sa.Table],
+    table_name: str,
+    chunk: pd.DataFrame,
+    conn: sa.Connection,
+) -> int:
+    """Resolve the names in a chunk to ids and insert it with executemany.
+
+    Args:
+        tables (Dict[str, sa.Table]): reflected tables of the db, resolved
+            before the transaction so no second connection is needed
+        table_name (str): table to insert into
+        chunk (pd.DataFrame): rows to insert, may hold tag_name or
+            ingredient_name instead of the matching id columns
+        conn (sa.Connection): db connection inside an open transaction
+
+    Raises:
+        KeyError: The chunk has columns the table does not know.
+
+    Returns:
+        int: number of inserted rows
+    """
+    table = tables[table_name]
+    if "tag_name" in chunk.columns and "tag_id" in table.c:
+        chunk = tag_name_to_id(chunk, tables["tags"], conn)
+    if "ingredient_name" in chunk.columns and "ingredient_id" in table.c:
+        chunk = ingredient_name_to_id(chunk, tables["ingredients"], conn)
+    unknown = set(chunk.columns) - set(table.c.keys())
+    if unknown:
+        raise KeyError(f"Table {table_name} has no columns {sorted(unknown)}.")
+    records = chunk.astype(object).where(chunk.notna(), None)
+    conn.execute(
+        table.insert(), cast(List[Dict[str, Any]], records.to_dict("records"))
+    )
+    return len(chunk)
+
+
+class ImportFailedError(RuntimeError):
+    """A chunk of a bulk import failed after earlier rows were committed."""
+
+    def __init__(self, message: str, committed: int) -> None:
+        """Initialize the class.
+
+        Args:
+            message (str): what failed
+            committed (int): rows committed before the failed transaction,
+                counted from the start of the file
+        """
+        super().__init__(message)
+        self.committed = committed
+
+
+def _failure(
+    err: Exception, rows: Tuple[int, int], committed: int
+) -> ImportFailedError:
+    """Describe a failed chunk and the rows committed before it.
+
+    Args:
+        err (Exception): error raised while writing the chunk
+        rows (Tuple[int, int]): first and last data row of the chunk,
+            counted from 1
+        committed (int): rows committed before the failed transaction
+
+    Returns:
+        ImportFailedError: error reporting the rows and the committed count
+    """
+    cause: Any = err
+    if isinstance(err, KeyError) and err.args:
+        cause = err.args[0]
+    elif isinstance(err, sa.exc.DBAPIError):
+        cause = err.orig
+    return ImportFailedError(
+        f"Rows {rows[0]}-{rows[1]} failed: {cause}. "
+        f"The first {committed} rows are committed.",
+        committed,
+    )
+
+
+def _write_batch(
+    conn: sa.Connection,
+    tables: Dict[str, sa.Table],
+    table_name: str,
+    chunks: Iterable[pd.DataFrame],
+    committed: int,
+) -> int:
+    """Write several chunks in one transaction.
+
+    Args:
+        conn (sa.Connection): db connection outside of a transaction
+        tables (Dict[str, sa.Table]): reflected tables of the db
+        table_name (str): table to insert into
+        chunks (Iterable[pd.DataFrame]): chunks of the transaction
+        committed (int): rows committed before, counted from the start of
+            the file
+
+    Raises:
+        ImportFailedError: A chunk could not be written, the transaction is
+            rolled back.
+
+    Returns:
+        int: number of written rows
+    """
+    written = 0
+    with conn.begin():
+        for chunk in chunks:
+            try:
+                written += write_chunk(tables, table_name, chunk, conn)
+            except WRITE_ERRORS as err:
+                first = committed + written + 1
+                rows = (first, first + len(chunk) - 1)
+                raise _failure(err, rows, committed) from err
+    return written
+
+
+@dataclass(frozen=True)
+class ImportOptions:
+    """Batching, resuming and progress reporting of a bulk import."""
+
+    chunk_size: int = CHUNK_SIZE
+    chunks_per_transaction: int = CHUNKS_PER_TRANSACTION
+    progress: Callable[[str], None] | None = None
+    skip_rows: int = 0
+
+
+def import_file(
+    db_location: str | Path,
+    table_name: str,
+    path: str | Path,
+    options: ImportOptions = ImportOptions(),
+) -> int:
+    """Stream a file into a table, committing every few chunks.
+
+    Only one chunk is held in memory at a time, so files far larger than
+    the available memory can be imported.
+
+    Args:
+        db_location (str | Path): The file location for the SQLite database.
+        table_name (str): table to insert into
+        path (str | Path): CSV or Parquet file
+        options (ImportOptions): rows per chunk, chunks committed together,
+            leading rows to skip when resuming and a function receiving
+            progress messages, which defaults to printing to stderr.
+            Defaults to ImportOptions().
+
+    Raises:
+        ImportFailedError: A chunk could not be written, its transaction is
+            rolled back while earlier transactions stay committed.
+
+    Returns:
+        int: number of imported rows
+    """
+    progress = options.progress or (lambda msg: print(msg, file=sys.stderr))
+    sql_handler = SQLHandler(db_location)
+    sql_handler.get_table(table_name)
+    tables = dict(sql_handler.meta.tables)
+    total = 0
+    start = time.perf_counter()
+    chunks = iter_chunks(path, options.chunk_size, options.skip_rows)
+    with sql_handler.engine.connect() as conn:
+        while True:
+            written = _write_batch(
+                conn,
+                tables,
+                table_name,
+                itertools.islice(chunks, options.chunks_per_transaction),
+                options.skip_rows + total,
+            )
+            if not written:
+                break
+            total += written
+            elapsed = time.perf_counter() - start
+            progress(
+                f"{table_name}: {total} rows in {elapsed:.1f}s "
+                f"({total / max(elapsed, 1e-9):.0f} rows/s)"
+            )
+    return total
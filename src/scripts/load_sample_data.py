@@ -21,6 +21,8 @@ from sqlalchemy import (
     Table,
 )
 
+from sql.change_tracker import get_tracker
+from sql.indexes import apply_indexes
 from sql.sql_handler import SQLHandler
 
 
@@ -36,8 +38,6 @@ def create_database(db_location: str | Path) -> None:
 
     sql_handler = SQLHandler(db_location)
 
-    engine = sql_handler.engine
-
     # Define the tags table
 
     metadata = MetaData()
@@ -82,7 +82,9 @@ def create_database(db_location: str | Path) -> None:
     )
 
     # Create the database
-    metadata.create_all(engine)
+    sql_handler.create_all(metadata)
+    apply_indexes(sql_handler)
+    get_tracker(db_location).install()
 
 
 def load_data(db_location: str | Path, data: Dict[str, DataFrame]) -> None:
@@ -103,11 +105,7 @@ def load_data(db_location: str | Path, data: Dict[str, DataFrame]) -> None:
             print(table_name, iter_df, sep="\n")
             # iter_df.to_excel(f"{table_name}.xlsx")
             ingredients_table = None
-            if table_name == "tags":
-                iter_df.to_sql(
-                    table_name, conn, if_exists="append", index=False
-                )
-            else:
+            if table_name != "tags":
                 if table_name != "ingredients":
                     ingredients_table = sql_handler.get_table("ingredients")
                 tag_table = sql_handler.get_table("tags")
@@ -126,6 +124,58 @@ def load_data(db_location: str | Path, data: Dict[str, DataFrame]) -> None:
             iter_df.to_sql(table_name, conn, if_exists="append", index=False)
 
 
+NAME_CHUNK_SIZE = 900
+
+
+def resolve_names(
+    data: pd.DataFrame,
+    table: sa.Table | None,
+    name_column: str,
+    id_column: str,
+    conn: sa.Connection,
+) -> pd.DataFrame:
+    """Replace a name column by the ids of the matching rows in one pass.
+
+    The distinct names are looked up in chunks of IN queries, staying below
+    sqlite's variable limit, and mapped onto the data with a vectorized
+    lookup instead of one query per row.
+
+    Args:
+        data (pd.DataFrame): dataframe with item names
+        table (sa.Table | None): table to get the ids from
+        name_column (str): name column in data and table
+        id_column (str): id column to add to data
+        conn (sa.Connection): db connection
+
+    Raises:
+        KeyError: Names that do not exist in the table, all at once.
+
+    Returns:
+        pd.DataFrame: dataframe with item ids
+    """
+    assert table is not None
+    names = data[name_column].dropna().unique().tolist()
+    found = []
+    for start in range(0, len(names), NAME_CHUNK_SIZE):
+        chunk = names[start : start + NAME_CHUNK_SIZE]
+        stmt = (
+            sa.select(table.c[name_column], table.c.id)
+            .where(table.c[name_column].in_(chunk))
+            .order_by(table.c.id)
+        )
+        found.append(pd.read_sql(stmt, conn))
+    rows = (
+        pd.concat(found) if found else pd.DataFrame(columns=[name_column, "id"])
+    )
+    # Keep the first id if a name occurs more than once.
+    lookup = rows.drop_duplicates(name_column).set_index(name_column)["id"]
+    missing = sorted(set(data[name_column]) - set(lookup.index), key=str)
+    if missing:
+        raise KeyError(f"Unknown {name_column} values: {missing}")
+    data = data.assign(**{id_column: data[name_column].map(lookup)})
+    return data.drop(name_column, axis=1)
+
+
 def ingredient_name_to_id(
     data: pd.DataFrame, table: sa.Table | None, conn: sa.Connection
 ) -> pd.DataFrame:
@@ -139,17 +189,7 @@ def ingredient_name_to_id(
     Returns:
         pd.DataFrame: dataframe with item ids
     """
-    ingredient_list = []
-    assert table is not None
-    for row in data.ingredient_name:
-        stmt = sa.select(table.c.id).where(table.c.ingredient_name == row)
-        ingredient_name_row = conn.execute(stmt).first()
-        assert ingredient_name_row
-        ingredient_name = ingredient_name_row[0]
-        ingredient_list.append(ingredient_name)
-    data["ingredient_id"] = pd.Series(ingredient_list)
-    data = data.drop("ingredient_name", axis=1)
-    return data
+    return resolve_names(data, table, "ingredient_name", "ingredient_id", conn)
 
 
 def tag_name_to_id(
@@ -165,18 +205,7 @@ def tag_name_to_id(
     Returns:
         pd.DataFrame: dataframe with item ids
     """
-    print(conn, type(conn))
-    tag_list = []
-    assert table is not None
-    for row in data.tag_name:
-        stmt = sa.select(table.c.id).where(table.c.tag_name == row)
-        tag_name_row = conn.execute(stmt).first()
-        assert tag_name_row
-        tag_name = tag_name_row[0]
-        tag_list.append(tag_name)
-    data["tag_id"] = pd.Series(tag_list)
-    data = data.drop("tag_name", axis=1)
-    return data
+    return resolve_names(data, table, "tag_name", "tag_id", conn)
 
 
 def main() -> None:
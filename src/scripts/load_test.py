@@ -0,0 +1,108 @@
+"""
+This script measures the requests per second a running app server handles.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import argparse
+import functools
+import json
+import statistics
+import threading
+import time
+import urllib.request
+from typing import Dict, List
+
+from src.scripts.bench_sqlite_profile import run_threads
+from src.scripts.benchmark import inventory_request
+
+SORTS = ("name_asc", "name_desc", "amount_asc", "amount_desc")
+
+
+def post_callback(url: str, body: bytes) -> None:
+    """Send a callback request and wait for its outputs.
+
+    Args:
+        url (str): base url of the app
+        body (bytes): json request body
+
+    Raises:
+        OSError: The request failed.
+    """
+    request = urllib.request.Request(
+        f"{url}/_dash-update-component",
+        data=body,
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+
+
+def load_test(
+    url: str, clients: int, duration: float
+) -> Dict[str, float | int]:
+    """Send inventory callback requests from concurrent clients.
+
+    Args:
+        url (str): base url of the app, e.g. http://127.0.0.1:8050
+        clients (int): concurrent clients, each waits for the outputs of
+            its request
+        duration (float): seconds to run
+
+    Returns:
+        Dict[str, float | int]: requests per second, latency percentiles
+        and failed requests
+    """
+    bodies = [json.dumps(inventory_request(sort)).encode() for sort in SORTS]
+    latencies: List[List[float]] = [[] for _ in range(clients)]
+    errors = [0] * clients
+    stop = threading.Event()
+
+    def client(slot: int) -> None:
+        count = 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                post_callback(url, bodies[count % len(bodies)])
+                latencies[slot].append(time.perf_counter() - start)
+            except OSError:
+                errors[slot] += 1
+            count += 1
+
+    run_threads(
+        [functools.partial(client, slot) for slot in range(clients)],
+        stop,
+        duration,
+    )
+    done = sorted(t for slot in latencies for t in slot)
+    if not done:
+        return {"requests_per_s": 0.0, "errors": sum(errors)}
+    quantiles = statistics.quantiles(done, n=100)
+    return {
+        "requests_per_s": len(done) / duration,
+        "p50_ms": quantiles[49] * 1e3,
+        "p95_ms": quantiles[94] * 1e3,
+        "p99_ms": quantiles[98] * 1e3,
+        "errors": sum(errors),
+    }
+
+
+def main() -> None:
+    """Load test a running server and print the results."""
+    parser = argparse.ArgumentParser(prog="python -m src.scripts.load_test")
+    parser.add_argument("--url", default="http://127.0.0.1:8050")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    for clients in args.clients:
+        result = load_test(args.url, clients, args.duration)
+        print(
+            f"{clients:>3} clients: "
+            + ", ".join(f"{key} {value:.1f}" for key, value in result.items())
+        )
+
+
+if __name__ == "__main__":
+    main()
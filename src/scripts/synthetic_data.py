@@ -0,0 +1,118 @@
+"""
+This script generates synthetic datasets of configurable size.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, cast
+
+import numpy as np
+import pandas as pd
+
+from sql.sql_handler import SQLHandler
+from src.scripts.load_sample_data import create_database
+
+TABLE_ORDER = ("tags", "meals", "ingredients", "ingredient_tags")
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Size and shape of a synthetic dataset.
+
+    Attributes:
+        ingredients (int): number of ingredients
+        meals (int): number of meals
+        tags (int): number of tags
+        fan_out (int): tags per ingredient, capped at the number of tags.
+            Defaults to 3.
+        seed (int): random seed. Defaults to 0.
+    """
+
+    ingredients: int
+    meals: int
+    tags: int
+    fan_out: int = 3
+    seed: int = 0
+
+
+def generate(spec: DatasetSpec) -> Dict[str, pd.DataFrame]:
+    """Generate the rows of all tables with explicit ids.
+
+    Args:
+        spec (DatasetSpec): size and shape of the dataset
+
+    Returns:
+        Dict[str, pd.DataFrame]: rows by table name
+    """
+    rng = np.random.default_rng(spec.seed)
+    ingredients, meals, tags = spec.ingredients, spec.meals, spec.tags
+    fan_out = min(spec.fan_out, tags)
+    ingredient_ids = np.arange(1, ingredients + 1)
+    # Random distinct tags per ingredient: the fan_out smallest keys per row.
+    tag_ids = (
+        np.argsort(rng.random((ingredients, tags)), axis=1)[:, :fan_out] + 1
+    )
+    return {
+        "tags": pd.DataFrame(
+            {
+                "id": np.arange(1, tags + 1),
+                "tag_name": [f"tag {i}" for i in range(1, tags + 1)],
+            }
+        ),
+        "meals": pd.DataFrame(
+            {
+                "id": np.arange(1, meals + 1),
+                "name": [f"meal {i}" for i in range(1, meals + 1)],
+            }
+        ),
+        "ingredients": pd.DataFrame(
+            {
+                "id": ingredient_ids,
+                "ingredient_name": [f"ingredient {i}" for i in ingredient_ids],
+                "inventory_amount": rng.integers(0, 10, ingredients).astype(
+                    float
+                ),
+                "recipe_amount": rng.integers(1, 5, ingredients).astype(float),
+                "meal_id": rng.integers(1, meals + 1, ingredients),
+                "tag_id": tag_ids[:, 0] if fan_out else None,
+            }
+        ),
+        "ingredient_tags": pd.DataFrame(
+            {
+                "ingredient_id": np.repeat(ingredient_ids, fan_out),
+                "tag_id": tag_ids.ravel(),
+            }
+        ),
+    }
+
+
+def create_synthetic_database(
+    db_location: str | Path, spec: DatasetSpec
+) -> Dict[str, int]:
+    """Create a new database filled with generated rows.
+
+    Args:
+        db_location (str | Path): The file location for the SQLite database,
+            must not exist yet.
+        spec (DatasetSpec): size and shape of the dataset
+
+    Raises:
+        FileExistsError: The database exists already.
+
+    Returns:
+        Dict[str, int]: number of rows by table name
+    """
+    if Path(db_location).exists():
+        raise FileExistsError(f"Database {db_location} exists already.")
+    create_database(db_location)
+    data = generate(spec)
+    sql_handler = SQLHandler(db_location)
+    with sql_handler.engine.begin() as conn:
+        for table_name in TABLE_ORDER:
+            table = sql_handler.get_table(table_name)
+            records = data[table_name].astype(object).to_dict("records")
+            conn.execute(table.insert(), cast(List[Dict[str, Any]], records))
+    return {name: len(rows) for name, rows in data.items()}
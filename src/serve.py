@@ -0,0 +1,77 @@
+"""
+This module contains the production server with multiple worker processes.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+from typing import Any, Dict
+
+from sql.autocomplete import get_search_index
+from sql.change_tracker import get_tracker
+from sql.sql_handler import SQLHandler
+from sql.tag_index import get_tag_index
+from src.config import AppConfig
+from src.index import create_app
+
+
+def preload(config: AppConfig) -> None:
+    """Reflect the schema, install the triggers and build the indexes.
+
+    The workers inherit the reflected metadata and the tag index, so none
+    of them has to build them on its first request. The search index is
+    created in the db once, before the workers race to create it.
+
+    Args:
+        config (AppConfig): configuration
+    """
+    SQLHandler(config.db_path).get_table("ingredients")
+    get_tag_index(config.db_path).refresh()
+    get_search_index(config.db_path).install()
+    get_tracker(config.db_path).close()
+
+
+def serve(config: AppConfig) -> None:
+    """Serve the app with gunicorn using worker processes and threads.
+
+    Args:
+        config (AppConfig): configuration
+
+    Raises:
+        ImportError: gunicorn is not installed.
+    """
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        from gunicorn.app.base import BaseApplication
+    except ImportError as err:
+        raise ImportError(
+            "The production server requires gunicorn to be installed."
+        ) from err
+
+    app = create_app(config)
+    preload(config)
+    options: Dict[str, Any] = {
+        "bind": f"{config.host}:{config.port}",
+        "workers": config.workers,
+        "threads": config.threads,
+        "worker_class": "gthread",
+        "preload_app": True,
+    }
+
+    class Application(BaseApplication):  # pylint: disable=abstract-method
+        """Gunicorn application serving the preloaded Flask server."""
+
+        def load_config(self) -> None:
+            """Apply the options to the gunicorn config."""
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self) -> Any:
+            """Return the WSGI app.
+
+            Returns:
+                Any: Flask server of the Dash app
+            """
+            return app.server
+
+    Application().run()
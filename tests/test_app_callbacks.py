@@ -0,0 +1,44 @@
+"""
+This module contains tests of the app callbacks through the Flask server.
+
+Author: Jonas Schrage
+Date: 17.10.2026
+
+"""
+import shutil
+from pathlib import Path
+
+from src.app_callbacks import STORE_TABLES
+from src.config import AppConfig
+from src.index import create_app
+
+EXAMPLE_DB = Path(__file__).parents[1] / "sql" / "example.db"
+
+
+def test_load_tables_updates_version_stores(tmp_path: Path) -> None:
+    """The interval callback answers with a version for every store."""
+    db_location = tmp_path / "food.db"
+    shutil.copy(EXAMPLE_DB, db_location)
+    client = create_app(AppConfig(db_path=db_location)).server.test_client()
+    outputs = [
+        {"id": f"{store_id}_version", "property": "data"}
+        for store_id in STORE_TABLES
+    ]
+    output = "...".join(f"{o['id']}.{o['property']}" for o in outputs)
+    response = client.post(
+        "/_dash-update-component",
+        json={
+            "output": f"..{output}..",
+            "outputs": outputs,
+            "inputs": [{"id": "10_min", "property": "n_intervals", "value": 1}],
+            "state": [
+                {"id": o["id"], "property": "data", "value": None}
+                for o in outputs
+            ],
+            "changedPropIds": ["10_min.n_intervals"],
+        },
+    )
+    assert response.status_code == 200
+    result = response.get_json()["response"]
+    assert sorted(result) == sorted(o["id"] for o in outputs)
+    assert all(isinstance(r["data"], int) for r in result.values())